@@ -0,0 +1,133 @@
+# archive.py
+"""
+Hot/cold compaction for the doubt tables (background loop + /compact).
+
+  • resolved doubts older than ARCHIVE_AFTER_DAYS → doubt_archive
+    (own id; the original is kept as doubt_id)
+  • doubt_quota rows before today are deleted (only today is ever read)
+  • SQLite: PRAGMA incremental_vacuum returns freed pages in small steps
+
+Work is done in short batches, each its own transaction, so the per-message
+quota/insert path never waits long on the write lock.
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt, logging, os
+
+from sqlalchemy import delete, func, insert, select
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+import database
+from database import session_scope, Doubt, DoubtArchive, DoubtQuota
+
+log = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+COMPACT_EVERY      = int(os.getenv("COMPACT_EVERY_S", str(6 * 3600)))
+BATCH              = 500       # rows moved per transaction
+VACUUM_PAGES       = 2_000     # pages freed per incremental_vacuum call
+
+_loop: asyncio.Task | None = None
+
+
+# ───────────────────────── steps (blocking – run in a thread)
+def archive_resolved(cutoff: dt.datetime) -> int:
+    """Move resolved doubts older than `cutoff` to doubt_archive."""
+    # doubt.id → doubt_id; doubt_archive numbers its own rows
+    src  = [c for c in Doubt.__table__.columns if c.name != "id"]
+    cols = ["doubt_id"] + [c.name for c in src]
+    src  = [Doubt.__table__.c.id] + src
+    moved = 0
+    while True:
+        with session_scope() as db:
+            # tables created before AUTOINCREMENT reuse max(id)+1: leaving
+            # the newest doubt in place keeps its id from being handed out again
+            top = db.scalar(select(func.max(Doubt.id)))
+            ids = db.scalars(
+                select(Doubt.id)
+                .where(Doubt.resolved.is_(True), Doubt.timestamp < cutoff, Doubt.id < top)
+                .order_by(Doubt.id)
+                .limit(BATCH)
+            ).all()
+            if not ids:
+                break
+            db.execute(
+                insert(DoubtArchive).from_select(
+                    cols, select(*src).where(Doubt.id.in_(ids))
+                )
+            )
+            db.execute(delete(Doubt).where(Doubt.id.in_(ids)))
+        moved += len(ids)
+    return moved
+
+
+def prune_quotas(today: dt.date) -> int:
+    """Drop quota rows for past days."""
+    with session_scope() as db:
+        res = db.execute(delete(DoubtQuota).where(DoubtQuota.date < today))
+        return res.rowcount or 0
+
+
+def incremental_vacuum(pages: int = VACUUM_PAGES) -> None:
+    if not database.IS_SQLITE:
+        return
+    raw = database.engine.raw_connection()
+    try:
+        # plain execute() only steps the pragma once (one page);
+        # executescript runs it to completion
+        raw.driver_connection.executescript(
+            f"PRAGMA incremental_vacuum({int(pages)});"
+        )
+    finally:
+        raw.close()
+
+
+def compact() -> dict:
+    cutoff = clock.utcnow() - dt.timedelta(days=ARCHIVE_AFTER_DAYS)
+    stats = {
+        "archived": archive_resolved(cutoff),
+        "quotas":   prune_quotas(clock.today()),
+    }
+    incremental_vacuum()
+    return stats
+
+
+# ───────────────────────── background loop
+async def _periodic():
+    while True:
+        try:
+            stats = await asyncio.to_thread(compact)
+            log.info("compaction: %s", stats)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("compaction failed")
+        await clock.sleep(COMPACT_EVERY)
+
+
+async def on_startup(app: Application):
+    global _loop
+    _loop = asyncio.create_task(_periodic())
+
+
+def on_shutdown():
+    if _loop:
+        _loop.cancel()
+
+
+# ───────────────────────── admin command
+async def cmd_compact(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    if u.effective_user.id != ctx.bot_data.get("admin_id"):
+        return await u.message.reply_text("⛔ Admins only.")
+    stats = await asyncio.to_thread(compact)
+    await u.message.reply_text(
+        f"🧹 Archived {stats['archived']} doubt(s), "
+        f"pruned {stats['quotas']} quota row(s)."
+    )
+
+
+def register_handlers(app: Application):
+    commands.add(app, "compact", cmd_compact, menu=False)
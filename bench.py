@@ -0,0 +1,167 @@
+# bench.py
+"""
+Micro-benchmarks (no Telegram needed; `sim` uses an in-memory SQLite DB).
+
+  python bench.py sessions [-n 1000000]   → bytes per live session, snapshot cost
+  python bench.py sim [-n 100000] [--countdowns 100000] [--keys 10]
+                      [--streaks 100000] [--days 3]
+                                          → Pomodoros, shared countdowns and streak
+                                            expiry on a virtual clock
+
+In production every finished work phase commits its own study_log row
+(leaderboard.record – roughly 800 commits/s on file-backed SQLite), and
+at -n 100000 those commits alone would take minutes.  The sim buffers
+them and writes them once with leaderboard.record_many inside the timed
+stage, so the Pomodoro row measures the scheduler; the per-commit cost
+is the real bound when thousands of phases end in the same second.
+"""
+
+from __future__ import annotations
+import argparse, asyncio, datetime as dt, gc, os, sys, time, tracemalloc
+from collections import Counter
+from types import SimpleNamespace as NS
+
+import sessions
+
+
+# ───────────────────────── sessions
+def _fill(kind: str, n: int):
+    store = sessions.SessionStore(kind)
+    now = time.time()
+    key = (dt.datetime(2026, 12, 6, 8, 30), "CLAT 2027")
+    for i in range(n):
+        cid = -1_000_000_000_000 - i           # realistic (large) chat ids
+        if kind == "timer":
+            s = sessions.TimerSession(10_000_000 + i, "Student", 1500, 300, now + i)
+        elif kind == "task":
+            s = sessions.TaskSession(10_000_000 + i, "Student", "Maths", now + i)
+        else:
+            s = sessions.CountdownSession(key, 100_000 + i)
+        store.put(cid, s)
+    return store
+
+
+def bench_sessions(n: int):
+    print(f"{'kind':<10} {'sessions':>10} {'bytes/session':>14} {'MB total':>9} {'snapshot ms':>12}")
+    for kind in ("timer", "task", "countdown"):
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        store = _fill(kind, n)
+        used = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        t0 = time.perf_counter()
+        k = sum(1 for _ in store.snapshot())
+        snap_ms = (time.perf_counter() - t0) * 1e3
+        assert k == n
+        print(f"{kind:<10} {n:>10} {used / n:>14.1f} {used / 2**20:>9.1f} {snap_ms:>12.1f}")
+        del store
+
+
+# ───────────────────────── virtual-clock simulation
+class _CountingBot:
+    """Stands in for telegram.Bot: counts outbound calls, sends nothing."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    async def send_message(self, chat_id, text, **kw):
+        self.calls["send_message"] += 1
+
+    async def edit_message_text(self, *a, **kw):
+        self.calls["edit_message_text"] += 1
+
+
+def bench_sim(n_timers: int, n_countdowns: int, n_keys: int, n_streaks: int, days: int):
+    # never the real DB: forced before `database` is first imported
+    if "database" in sys.modules:
+        raise RuntimeError("bench sim must run before `database` is imported")
+    os.environ["DATABASE_URL"] = "sqlite://"
+    import clock, countdown, database, leaderboard, streak, timer
+
+    database.init_db()
+    clk = clock.VirtualClock(dt.datetime(2026, 10, 19, tzinfo=dt.timezone.utc).timestamp())
+    clock.install(clk)
+    bot = _CountingBot()
+    ctx = NS(bot=bot)
+
+    print(f"{'stage':<28} {'virtual':>9} {'wall s':>8} {'speed-up':>9} "
+          f"{'timers':>9} {'wakeups':>9} {'msgs out':>9}")
+
+    async def stage(name: str, virtual_s: float, setup=None, teardown=None):
+        sleeps0, wake0, out0 = clk.sleeps, clk.wakeups, sum(bot.calls.values())
+        t0 = time.perf_counter()
+        if setup:
+            await setup()
+        await clk.advance(virtual_s)
+        if teardown:
+            await teardown()
+        wall = time.perf_counter() - t0
+        print(f"{name:<28} {virtual_s / 3600:>8.1f}h {wall:>8.2f} {virtual_s / wall:>9.0f} "
+              f"{clk.sleeps - sleeps0:>9} {clk.wakeups - wake0:>9} "
+              f"{sum(bot.calls.values()) - out0:>9}")
+
+    logged, record = [], leaderboard.record
+
+    async def start_timers():
+        leaderboard.record = lambda *e: logged.append(e)     # see module doc
+        for i in range(n_timers):
+            src = NS(message=None, effective_chat=NS(id=-1 - i),
+                     effective_user=NS(id=1 + i, first_name="S"))
+            await timer._begin(src, ctx, 25, 5)
+
+    async def flush_log():
+        leaderboard.record = record
+        leaderboard.record_many(logged)
+
+    async def start_countdowns():
+        target = clk.utcnow() + dt.timedelta(days=30)
+        for i in range(n_countdowns):
+            key = (target + dt.timedelta(hours=i % n_keys), f"Exam {i % n_keys}")
+            countdown.subscribe(-1 - i, 100 + i, key, bot)
+
+    async def stop_countdowns():
+        for cid in [cid for sc in countdown.shared.values() for cid in sc.subs]:
+            countdown.unsubscribe(cid)
+
+    async def start_streaks():
+        for uid in range(n_streaks):
+            s = streak.streaks[uid] = streak.Streak()
+            s.days, s.last = 5, clk.today()
+        asyncio.get_running_loop().create_task(streak._hourly(bot))
+
+    async def run():
+        await stage(f"{n_timers} Pomodoros 25|5", 31 * 60, start_timers, flush_log)
+        assert len(sessions.timers) == 0, "sessions left running"
+        await stage(f"{n_countdowns} countdowns, {n_keys} keys", 3600,
+                    start_countdowns, stop_countdowns)
+        assert not countdown.shared, "countdowns left running"
+        await stage(f"{n_streaks} streaks, {days} days", days * 86400, start_streaks)
+
+    asyncio.run(run())
+    print("outbound by method:", dict(bot.calls))
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__)
+    sub = p.add_subparsers(dest="bench", required=True)
+    s = sub.add_parser("sessions")
+    s.add_argument("-n", type=int, default=1_000_000)
+    m = sub.add_parser("sim")
+    m.add_argument("-n", type=int, default=100_000, help="concurrent Pomodoros")
+    m.add_argument("--countdowns", type=int, default=100_000, help="countdown messages")
+    m.add_argument("--keys", type=int, default=10, help="distinct countdowns they share")
+    m.add_argument("--streaks", type=int, default=100_000)
+    m.add_argument("--days", type=int, default=3)
+    a = p.parse_args(argv)
+
+    if a.bench == "sessions":
+        bench_sessions(a.n)
+    else:
+        bench_sim(a.n, a.countdowns, max(1, a.keys), a.streaks, a.days)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
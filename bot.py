@@ -1,22 +1,28 @@
 # bot.py
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
 
-from telegram import BotCommand
-from telegram.ext import (
-    Application,
-    CommandHandler,
-    MessageHandler,
-    filters,
-)
+from telegram.ext import Application
 
+import checkpoint
+import commands
 import database
+import lifecycle
 import timer
 import countdown
 import streak
 import study_tasks
 import doubts
+import doubt_stats
+import export
+import archive
+import flood
+import rooms
+import leaderboard
+import report
+import reminders
 
 # ────────── Environment & Logging ──────────
 load_dotenv()
@@ -33,39 +39,23 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
-# ────────── Telegram Command Menu ──────────
-COMMAND_MENU = [
-    BotCommand("start",         "Restart the bot"),
-    BotCommand("help",          "Show help message"),
-    BotCommand("task_start",    "Start stopwatch study task"),
-    BotCommand("task_status",   "Show task timer"),
-    BotCommand("task_pause",    "Pause task"),
-    BotCommand("task_resume",   "Resume task"),
-    BotCommand("task_stop",     "Stop & log task"),
-    BotCommand("timer",         "Start Pomodoro"),
-    BotCommand("timer_status",  "Pomodoro status"),
-    BotCommand("timer_pause",   "Pause Pomodoro"),
-    BotCommand("timer_resume",  "Resume Pomodoro"),
-    BotCommand("timer_stop",    "Stop Pomodoro"),
-    BotCommand("countdown",        "Start live countdown"),
-    BotCommand("countdownstatus",  "Countdown status"),
-    BotCommand("countdownstop",    "Cancel countdown"),
-    BotCommand("checkin",       "Record today’s check-in"),
-    BotCommand("mystreak",      "Show study streak"),
-    BotCommand("streak_alerts", "Toggle streak alerts"),
-    BotCommand("doubt",         "Raise a study doubt"),  # newly added
-]
-KNOWN_CMDS = [c.command for c in COMMAND_MENU]
-
 # ────────── Build Application ──────────
-async def _set_bot_menu(app: Application):
-    await app.bot.set_my_commands(COMMAND_MENU)
+# modules with an on_startup(app) hook (background loops, state restore)
+STARTUP = [checkpoint, streak, archive, leaderboard, report, reminders]
+# modules whose loops are cancelled on shutdown (see lifecycle.py)
+SHUTDOWN = [timer, study_tasks, countdown, rooms, streak, archive, report, reminders]
+
+async def _post_init(app: Application):
+    # the menu is generated from the command table (see commands.py)
+    await app.bot.set_my_commands(commands.menu(app))
+    for mod in STARTUP:
+        await mod.on_startup(app)
 
 def build_app() -> Application:
     app = (
         Application.builder()
         .token(BOT_TOKEN)
-        .post_init(_set_bot_menu)
+        .post_init(_post_init)
         .build()
     )
 
@@ -79,27 +69,39 @@ def build_app() -> Application:
             "*How to use the bot*\n"
             "• `/task_start MATHS` – begin stopwatch\n"
             "• `/timer` – pick a Pomodoro preset\n"
-            "• `/countdown` – live event timer\n"
+            "• `/room_create NAME`, `/room_join NAME` – study together\n"
+            "• `/countdown` – live event timer (`/countdown clat` for CLAT)\n"
             "• `/checkin`, `/mystreak`, `/streak_alerts on`\n"
+            "• `/leaderboard [day|week] [global]` – study-time ranks\n"
+            "• `/weekly_report on` – Monday summary of your week\n"
+            "• `/remind 19:00` – daily study reminder\n"
             "• `/doubt` – submit your question privately or publicly\n"
             "\nTap the menu (↓) for the full list."
         )
 
-    app.add_handler(CommandHandler("start", _start))
-    app.add_handler(CommandHandler("help",  _help))
+    # flood control runs ahead of every handler below
+    flood.register_handlers(app)
+
+    commands.add(app, "start", _start, "Restart the bot",   owner=__name__)
+    commands.add(app, "help",  _help,  "Show help message", owner=__name__)
 
-    # Plug-in modules
+    # Plug-in modules (declaring the same command twice raises here)
+    study_tasks.register_handlers(app)
     timer.register_handlers(app)
+    rooms.register_handlers(app)
     countdown.register_handlers(app)
     streak.register_handlers(app)
-    study_tasks.register_handlers(app)
+    leaderboard.register_handlers(app)
+    report.register_handlers(app)
+    reminders.register_handlers(app)
     doubts.register_handlers(app, ADMIN_ID)
+    doubt_stats.register_handlers(app)
+    export.register_handlers(app)
+    archive.register_handlers(app)
 
-    # Unknown command fallback
-    unknown_filter = filters.COMMAND & ~filters.Regex(rf"^/({'|'.join(KNOWN_CMDS)})")
-    async def _unknown(update, context):
-        await update.message.reply_text("❓ Unknown command – type /help.")
-    app.add_handler(MessageHandler(unknown_filter, _unknown))
+    # Single router for every plain command + unknown-command fallback;
+    # must come after the ConversationHandlers above
+    commands.install(app)
 
     return app
 
@@ -110,10 +112,12 @@ if __name__ == "__main__":
     webhook_url = f"{WEBHOOK_ROOT}/{WEBHOOK_PATH}"
     log.info("Webhook → %s (port %s)", webhook_url, PORT)
 
-    application.run_webhook(
+    # SIGTERM → drain handlers, checkpoint sessions, flush outbound queue
+    asyncio.run(lifecycle.serve(
+        application,
+        SHUTDOWN,
         listen="0.0.0.0",
         port=PORT,
         url_path=WEBHOOK_PATH,
         webhook_url=webhook_url,
-        stop_signals=None,  # Render manages shutdown itself
-    )
+    ))
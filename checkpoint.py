@@ -0,0 +1,87 @@
+# checkpoint.py
+"""
+Live in-memory state carried across a restart (timers, stopwatch tasks,
+countdowns, rooms, streaks).
+
+Each stateful module exposes
+    checkpoint()        → [(key, dict)]  JSON-able snapshot of its state
+    restore(rows, bot)  → rebuild that state and restart its loops
+
+On shutdown `collect()` snapshots every module in one synchronous pass
+(nothing can change in between) and `write()` replaces the `checkpoint`
+table with it.  On startup the rows are handed back to their module and
+deleted, so a checkpoint is restored at most once.  Rows older than
+MAX_AGE are dropped: on an overlapping deploy the new instance starts
+before the old one saves, and that state must not resurface at the
+deploy after.
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt, json, logging, os
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from telegram.ext import Application
+
+import clock
+import countdown
+import rooms
+import streak
+import study_tasks
+import timer
+from database import session_scope, Checkpoint
+
+log = logging.getLogger(__name__)
+
+STATEFUL = (timer, study_tasks, countdown, rooms, streak)
+MAX_AGE  = dt.timedelta(seconds=int(os.getenv("CHECKPOINT_MAX_AGE_S", "600")))
+
+Row = Tuple[str, str, str]          # module, key, JSON
+
+
+def collect() -> List[Row]:
+    return [
+        (mod.__name__, key, json.dumps(data))
+        for mod in STATEFUL
+        for key, data in mod.checkpoint()
+    ]
+
+
+def write(rows: List[Row]):
+    with session_scope() as db:
+        db.execute(delete(Checkpoint))
+        if rows:
+            now = clock.utcnow()
+            db.execute(insert(Checkpoint), [
+                {"kind": kind, "key": key, "data": data, "saved_at": now}
+                for kind, key, data in rows
+            ])
+
+
+def _take() -> Tuple[List[Row], int]:
+    """Fresh rows, and how many stale ones were dropped with them."""
+    with session_scope() as db:
+        rows = [tuple(r) for r in db.execute(
+            select(Checkpoint.kind, Checkpoint.key, Checkpoint.data)
+            .where(Checkpoint.saved_at >= clock.utcnow() - MAX_AGE)
+        )]
+        stale = db.execute(delete(Checkpoint)).rowcount - len(rows)
+    return rows, stale
+
+
+async def on_startup(app: Application):
+    rows, stale = await asyncio.to_thread(_take)
+    if stale:
+        log.info("dropped %d checkpoint row(s) older than %s", stale, MAX_AGE)
+    by_kind: Dict[str, list] = defaultdict(list)
+    for kind, key, data in rows:
+        by_kind[kind].append((key, json.loads(data)))
+    for mod in STATEFUL:
+        if by_kind[mod.__name__]:
+            try:
+                mod.restore(by_kind[mod.__name__], app.bot)
+            except Exception:
+                log.exception("restoring %s checkpoint failed", mod.__name__)
+    if rows:
+        log.info("restored %d checkpoint row(s)", len(rows))
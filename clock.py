@@ -0,0 +1,117 @@
+# clock.py
+"""
+The one place the bot reads time or sleeps.
+
+Modules call `clock.time()`, `clock.utcnow()`, `clock.today()`,
+`clock.monotonic()` and `await clock.sleep(s)` instead of `time` /
+`datetime` / `asyncio.sleep` directly, so a simulation can `install()` a
+VirtualClock and push hours or days of timers, countdowns and streaks
+through in seconds (see `python bench.py sim`).
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt, heapq, itertools, time as _time
+from typing import List, Tuple
+
+
+class RealClock:
+    def time(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+    def utcnow(self) -> dt.datetime:
+        return dt.datetime.utcnow()
+
+    def today(self) -> dt.date:
+        return dt.date.today()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Time stands still until `advance()` moves it; sleepers wake in order
+    of their deadline, each at its exact virtual instant.
+    """
+
+    def __init__(self, start: float, settle: int = 4):
+        self._now = float(start)
+        self._heap: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.settle = settle           # loop turns granted to woken tasks
+        self.sleeps = 0                # timers scheduled
+        self.wakeups = 0               # timers fired
+
+    def time(self) -> float:
+        return self._now
+
+    monotonic = time
+
+    def utcnow(self) -> dt.datetime:
+        return dt.datetime.utcfromtimestamp(self._now)
+
+    def today(self) -> dt.date:
+        return dt.date.fromtimestamp(self._now)
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (self._now + seconds, next(self._seq), fut))
+        self.sleeps += 1
+        await fut
+
+    async def _settle(self):
+        for _ in range(self.settle):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds: float):
+        """Move time forward, waking every sleeper due on the way."""
+        end = self._now + seconds
+        await self._settle()               # let freshly created tasks reach their sleep
+        while self._heap and self._heap[0][0] <= end:
+            when = self._heap[0][0]
+            self._now = max(self._now, when)
+            while self._heap and self._heap[0][0] <= when:
+                _, _, fut = heapq.heappop(self._heap)
+                if not fut.done():         # cancelled sleepers are skipped
+                    fut.set_result(None)
+                    self.wakeups += 1
+            await self._settle()
+        self._now = end
+        await self._settle()
+
+
+_clock: RealClock | VirtualClock = RealClock()
+
+
+def install(c: RealClock | VirtualClock):
+    global _clock
+    _clock = c
+
+
+def time() -> float:
+    return _clock.time()
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def utcnow() -> dt.datetime:
+    return _clock.utcnow()
+
+
+def today() -> dt.date:
+    return _clock.today()
+
+
+async def sleep(seconds: float):
+    await _clock.sleep(seconds)
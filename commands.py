@@ -0,0 +1,76 @@
+# commands.py
+"""
+Central command table.
+
+Modules declare their commands with `add()` instead of adding one
+CommandHandler each.  The table (kept in `app.bot_data`) is the single
+source for:
+  • duplicate detection – a second module claiming a name fails at startup
+  • dispatch – one MessageHandler parses "/name@bot args" and does a dict
+    lookup, instead of PTB testing every CommandHandler in turn
+  • the Telegram menu (`menu()`) and the unknown-command reply
+
+Commands that open a ConversationHandler are declared with callback=None:
+they get a menu entry and a reserved name, and the conversation's own
+entry point (registered before `install()`) handles them.
+"""
+
+from __future__ import annotations
+from typing import Awaitable, Callable, Dict, List
+
+from telegram import BotCommand, Update
+from telegram.ext import Application, ContextTypes, MessageHandler, filters
+
+Callback = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[object]]
+
+
+class Command:
+    __slots__ = ("name", "callback", "description", "menu", "owner")
+
+    def __init__(self, name: str, callback: Callback | None, description: str,
+                 menu: bool, owner: str):
+        self.name        = name
+        self.callback    = callback
+        self.description = description
+        self.menu        = menu
+        self.owner       = owner
+
+
+def _table(bot_data) -> Dict[str, Command]:
+    return bot_data.setdefault("commands", {})
+
+
+def add(app: Application, name: str, callback: Callback | None,
+        description: str = "", *, menu: bool = True, owner: str | None = None):
+    """Declare /name. Raises ValueError if another module already did."""
+    owner = owner or (callback.__module__ if callback else "?")
+    table = _table(app.bot_data)
+    prev = table.get(name)
+    if prev:
+        raise ValueError(f"/{name} declared by both {prev.owner} and {owner}")
+    table[name] = Command(name, callback, description, menu and bool(description), owner)
+
+
+def menu(app: Application) -> List[BotCommand]:
+    return [BotCommand(c.name, c.description) for c in _table(app.bot_data).values() if c.menu]
+
+
+# ───────────────────────── dispatch
+async def _dispatch(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    msg = update.effective_message
+    parts = (msg.text or msg.caption or "").split()
+    name, _, target = parts[0][1:].partition("@")
+    if target and target.lower() != (ctx.bot.username or "").lower():
+        return                                  # addressed to another bot
+
+    cmd = _table(ctx.bot_data).get(name.lower())
+    if cmd is None:
+        await msg.reply_text("❓ Unknown command – type /help.")
+    elif cmd.callback is not None:
+        ctx.args = parts[1:]
+        await cmd.callback(update, ctx)
+
+
+def install(app: Application):
+    """Add the router; call after every ConversationHandler is registered."""
+    app.add_handler(MessageHandler(filters.COMMAND, _dispatch))
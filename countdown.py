@@ -2,19 +2,27 @@
 """
 Live event-countdown wizard
   /countdown                → date → time → label → pin? → starts live edit
+  /countdown clat           → join an official exam countdown directly
   /countdownstatus          → show remaining once
   /countdownstop            → cancel
+
+Chats counting down to the same (target, label) share one countdown: the
+text is rendered once per tick and the edits are fanned out to every
+subscribed message through a bounded pool.  The tick stretches with the
+number of live countdown messages so all of them together stay under
+EDIT_RATE edits/s, and a RetryAfter pauses the countdown as asked.
 """
 
 from __future__ import annotations
-import asyncio, datetime as dt
-from typing import Dict
+import asyncio, datetime as dt, logging, os
+from typing import Dict, Set, Tuple
 
 from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     Update,
 )
+from telegram.error import BadRequest, Forbidden, RetryAfter
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -25,10 +33,35 @@ from telegram.ext import (
     filters,
 )
 
+import clock
+import commands
+from fanout import fan_out, retry_after
+from sessions import CountdownSession, countdowns
+
+log = logging.getLogger(__name__)
+
 ASK_DATE, ASK_TIME, ASK_LABEL, ASK_PIN = range(4)
+TICK = 2                                       # live update every 2 s …
+EDIT_RATE = float(os.getenv("COUNTDOWN_EDIT_RATE", "10"))   # … within edits/s overall
+
+Key = Tuple[dt.datetime, str]                  # (target UTC, label)
+
+# official exam dates (UTC) – update when the notification is out
+OFFICIAL: Dict[str, Key] = {
+    "clat": (dt.datetime(2026, 12, 6, 8, 30), "CLAT 2027"),
+}
+
 
-meta:  Dict[int, dict] = {}   # chat_id → {target,label,msg_id,pin}
-tasks: Dict[int, asyncio.Task] = {}
+class _Shared:
+    __slots__ = ("key", "subs", "task")
+
+    def __init__(self, key: Key):
+        self.key  = key
+        self.subs: Set[int] = set()            # chat_ids; msg in sessions.countdowns
+        self.task: asyncio.Task | None = None
+
+
+shared: Dict[Key, _Shared] = {}                # (target, label) → countdown
 
 # ───────────────────────── helpers
 def _parse_date(s: str) -> dt.date | None:
@@ -49,6 +82,16 @@ def _parse_time(s: str) -> dt.time | None:
 
 # ───────────────────────── wizard steps
 async def start(u: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
+    if ctx.args:
+        key = OFFICIAL.get(ctx.args[0].lower())
+        if not key:
+            await u.message.reply_text(
+                f"❌ Unknown event. Official: {', '.join(OFFICIAL)}"
+            )
+            return ConversationHandler.END
+        m = await u.message.reply_text("⏳ Starting countdown…")
+        subscribe(u.effective_chat.id, m.message_id, key, ctx.bot)
+        return ConversationHandler.END
     await u.message.reply_text("📅 Target *date*? (YYYY-MM-DD)", parse_mode="Markdown")
     return ASK_DATE
 
@@ -104,72 +147,144 @@ async def pin_choice(q_upd: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
     target = dt.datetime.combine(d, t)
     cid = q.message.chat.id
 
-    # cancel previous
-    if cid in tasks:
-        tasks[cid].cancel()
-        tasks.pop(cid, None)
-        meta.pop(cid, None)
-
     m = await q.message.reply_text("⏳ Starting countdown…")
     if pin:
         await q.bot.pin_chat_message(cid, m.message_id, disable_notification=True)
 
-    meta[cid] = {"target": target, "label": label, "msg_id": m.message_id}
-    _launch(cid, ctx)
+    subscribe(cid, m.message_id, (target, label), ctx.bot)
     return ConversationHandler.END
 
 
-# ───────────────────────── live edit
-async def _edit(cid: int, bot) -> bool:
-    m = meta[cid]
-    now = dt.datetime.utcnow()
-    rem = m["target"] - now
+# ───────────────────────── shared countdowns
+def _render(key: Key, now: dt.datetime) -> Tuple[str, bool]:
+    """Text for `key` at `now`, and whether the countdown is still running."""
+    target, label = key
+    rem = target - now
     if rem.total_seconds() <= 0:
-        await bot.edit_message_text(
-            chat_id=cid, message_id=m["msg_id"], text=f"🎉 {m['label']} reached!"
-        )
-        return False
+        return f"🎉 {label} reached!", False
     days = rem.days
     hrs, r = divmod(rem.seconds, 3600)
     mins, secs = divmod(r, 60)
-    txt = (
-        f"⏳ *{m['label']}*\n"
+    return (
+        f"⏳ *{label}*\n"
         f"{days}d {hrs}h {mins}m {secs}s remaining."
-    )
-    await bot.edit_message_text(
-        cid, m["msg_id"], text=txt, parse_mode="Markdown"
-    )
-    return True
-
-
-def _launch(cid: int, ctx: ContextTypes.DEFAULT_TYPE):
-    async def loop():
-        try:
-            while await _edit(cid, ctx.bot):
-                await asyncio.sleep(2)   # live update every 2 s
-        except asyncio.CancelledError:
-            pass
-
-    tasks[cid] = asyncio.create_task(loop())
+    ), True
+
+
+def subscribe(cid: int, msg_id: int, key: Key, bot):
+    """Attach a chat's message to the shared countdown for `key`."""
+    unsubscribe(cid)
+    sc = shared.get(key)
+    if sc is None:
+        sc = shared[key] = _Shared(key)
+    sc.subs.add(cid)
+    countdowns.put(cid, CountdownSession(key, msg_id))
+    if sc.task is None:
+        sc.task = asyncio.create_task(_run(sc, bot))
+
+
+def unsubscribe(cid: int):
+    cs = countdowns.pop(cid)
+    sc = shared.get(cs.key) if cs else None
+    if not sc:
+        return
+    sc.subs.discard(cid)
+    if not sc.subs:
+        shared.pop(cs.key, None)
+        if sc.task:
+            sc.task.cancel()
+
+
+def _interval() -> float:
+    """Seconds between ticks: TICK, or longer once every message can't be edited that often."""
+    return max(TICK, len(countdowns) / EDIT_RATE)
+
+
+async def _tick(sc: _Shared, bot) -> Tuple[bool, float]:
+    """
+    Render once, edit every subscriber.  Returns (still running, seconds
+    Telegram asked us to back off – 0 if none).
+    """
+    txt, alive = _render(sc.key, clock.utcnow())
+    mode = "Markdown" if alive else None
+
+    async def edit(cid: int):
+        cs = countdowns.get(cid)
+        if cs is not None:
+            await bot.edit_message_text(
+                chat_id=cid, message_id=cs.msg_id, text=txt, parse_mode=mode
+            )
+
+    failed = await fan_out(edit, list(sc.subs))
+    backoff = 0.0
+    for cid, err in failed.items():
+        if isinstance(err, RetryAfter):
+            backoff = max(backoff, retry_after(err))
+            continue                               # try again after the pause
+        if isinstance(err, BadRequest) and "not modified" in str(err):
+            continue
+        if isinstance(err, (BadRequest, Forbidden)):
+            log.info("countdown: dropping chat %s (%s)", cid, err)
+            countdowns.pop(cid)
+            sc.subs.discard(cid)
+        else:
+            log.warning("countdown edit failed for %s: %s", cid, err)
+    return alive and bool(sc.subs), backoff
+
+
+async def _run(sc: _Shared, bot):
+    try:
+        while True:
+            t0 = clock.monotonic()
+            alive, backoff = await _tick(sc, bot)
+            if not alive:
+                break
+            gap = max(_interval(), backoff)
+            await clock.sleep(max(0.0, gap - (clock.monotonic() - t0)))
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if shared.get(sc.key) is sc:
+            shared.pop(sc.key, None)
+            for cid in sc.subs:
+                countdowns.pop(cid)
 
 
 # ───────────────────────── simple commands
 async def status(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    if u.effective_chat.id not in meta:
+    cs = countdowns.get(u.effective_chat.id)
+    if not cs:
         await u.message.reply_text("ℹ️ No active countdown.")
     else:
-        await _edit(u.effective_chat.id, ctx.bot)
+        txt, alive = _render(cs.key, clock.utcnow())
+        await u.message.reply_text(txt, parse_mode="Markdown" if alive else None)
 
 
 async def stop(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    cid = u.effective_chat.id
-    t = tasks.pop(cid, None)
-    meta.pop(cid, None)
-    if t:
-        t.cancel()
+    unsubscribe(u.effective_chat.id)
     await u.message.reply_text("🚫 Countdown cancelled.")
 
 
+# ───────────────────────── checkpoint (see checkpoint.py)
+def checkpoint():
+    return [
+        (str(cid), {"target": cs.key[0].isoformat(), "label": cs.key[1], "msg_id": cs.msg_id})
+        for cid, cs in countdowns.snapshot()
+    ]
+
+
+def restore(rows, bot):
+    for key, d in rows:
+        target = dt.datetime.fromisoformat(d["target"])
+        subscribe(int(key), d["msg_id"], (target, d["label"]), bot)
+
+
+def on_shutdown():
+    for sc in list(shared.values()):
+        if sc.task:
+            sc.task.cancel()
+
+
 # ───────────────────────── registration
 def register_handlers(app: Application):
     conv = ConversationHandler(
@@ -184,5 +299,6 @@ def register_handlers(app: Application):
         per_chat=True,
     )
     app.add_handler(conv)
-    app.add_handler(CommandHandler("countdownstatus", status))
-    app.add_handler(CommandHandler("countdownstop",   stop))
+    commands.add(app, "countdown",       None,   "Start live countdown", owner=__name__)
+    commands.add(app, "countdownstatus", status, "Countdown status")
+    commands.add(app, "countdownstop",   stop,   "Cancel countdown")
@@ -5,21 +5,49 @@ Re-exports the model classes for convenience (no circular import).
 """
 
 import os, contextlib
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 import models  # ← owns Base + tables
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./legalight.db")
 
-connect_args = (
-    {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+IS_SQLITE    = DATABASE_URL.startswith("sqlite")
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
 engine        = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal  = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 def init_db():
+    if IS_SQLITE:
+        # incremental auto-vacuum lets archive.py hand freed pages back
+        # to the OS in small steps instead of a blocking full VACUUM
+        with engine.connect() as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")   # one-off, applies the mode
     models.Base.metadata.create_all(bind=engine)
+    _upgrade_schema()
+
+def _upgrade_schema():
+    """
+    create_all() never alters existing tables: add new nullable columns
+    and any index the models declare but the table lacks.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in models.Base.metadata.sorted_tables:
+            have = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in have and col.nullable:
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN {col.name} "
+                        f"{col.type.compile(engine.dialect)}"
+                    )
+            for idx in table.indexes:
+                idx.create(conn, checkfirst=True)
+        # archived before doubt_archive had its own ids: id was doubt.id
+        arc = models.DoubtArchive.__table__
+        conn.execute(arc.update().where(arc.c.doubt_id.is_(None)).values(doubt_id=arc.c.id))
 
 @contextlib.contextmanager
 def session_scope():
@@ -34,5 +62,12 @@ def session_scope():
         db.close()
 
 # handy re-exports (NOT imported by models, so no loop)
-Doubt       = models.Doubt
-DoubtQuota  = models.DoubtQuota
+Doubt        = models.Doubt
+DoubtQuota   = models.DoubtQuota
+DoubtArchive = models.DoubtArchive
+DoubtStat    = models.DoubtStat
+Media        = models.Media
+StudyLog     = models.StudyLog
+ReportOptIn  = models.ReportOptIn
+Reminder     = models.Reminder
+Checkpoint   = models.Checkpoint
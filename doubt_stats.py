@@ -0,0 +1,181 @@
+# doubt_stats.py
+"""
+Doubt analytics for the admin, answered from materialised counters.
+
+  /doubt_stats [days]       → breakdown + daily trend (default 30 days)
+  /doubt_stats rebuild      → recount doubt + doubt_archive from scratch
+  /doubt_resolve ID         → mark a doubt resolved
+
+`doubt_stat` holds one count per (day, subject, nature, public, resolved).
+`bump()` runs inside the transaction that inserts or changes the doubt,
+so the counters never drift from the rows; a report reads at most
+days × categories rows instead of scanning `doubt`.  Custom (typed)
+subjects and natures are counted under "Other / Custom".
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt
+from collections import Counter
+from typing import Dict, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+from database import session_scope, Doubt, DoubtArchive, DoubtStat
+
+DEFAULT_DAYS = 30
+MAX_DAYS     = 366
+BAR_WIDTH    = 16
+SPARK        = "▁▂▃▄▅▆▇█"
+
+StatKey = Tuple[dt.date, str, str, bool, bool]
+
+
+def _key(day: dt.date, subject: str, nature: str, is_public: bool, resolved: bool) -> StatKey:
+    # lazy: doubts imports this module
+    from doubts import NATURES, SUBJECTS, Nature, Subject
+    return (
+        day,
+        subject if subject in SUBJECTS else Subject.OTHER.value,
+        nature if nature in NATURES else Nature.OTHER.value,
+        bool(is_public),
+        bool(resolved),
+    )
+
+
+# ───────────────────────── write side
+def bump(db: Session, day: dt.date, subject: str, nature: str,
+         is_public: bool, resolved: bool, delta: int = 1):
+    """Add `delta` to one counter inside the caller's transaction."""
+    pk = _key(day, subject, nature, is_public, resolved)
+    stat = db.get(DoubtStat, pk)
+    if stat is None:
+        day, subject, nature, is_public, resolved = pk
+        stat = DoubtStat(day=day, subject=subject, nature=nature,
+                         is_public=is_public, resolved=resolved, count=0)
+        db.add(stat)
+    stat.count += delta
+
+
+def rebuild() -> int:
+    """Recount everything (doubt + doubt_archive); returns the number of doubts."""
+    totals: Counter = Counter()
+    with session_scope() as db:
+        for t in (Doubt, DoubtArchive):
+            day = func.date(t.timestamp)
+            for d, subj, nat, pub, res, n in db.execute(
+                select(day, t.subject, t.nature, t.is_public, t.resolved, func.count())
+                .group_by(day, t.subject, t.nature, t.is_public, t.resolved)
+            ):
+                totals[_key(dt.date.fromisoformat(str(d)), subj, nat, pub, res)] += n
+        db.execute(delete(DoubtStat))
+        if totals:
+            db.execute(insert(DoubtStat), [
+                dict(zip(("day", "subject", "nature", "is_public", "resolved"), k), count=n)
+                for k, n in totals.items()
+            ])
+    return sum(totals.values())
+
+
+# ───────────────────────── read side
+def collect(since: dt.date) -> Dict[str, Counter]:
+    out = {k: Counter() for k in ("subject", "nature", "status", "day")}
+    with session_scope() as db:
+        for day, subj, nat, pub, res, n in db.execute(
+            select(DoubtStat.day, DoubtStat.subject, DoubtStat.nature,
+                   DoubtStat.is_public, DoubtStat.resolved, DoubtStat.count)
+            .where(DoubtStat.day >= since)
+        ):
+            if not n:
+                continue                   # emptied by /doubt_resolve
+            out["subject"][subj] += n
+            out["nature"][nat] += n
+            out["status"]["public" if pub else "private"] += n
+            out["status"]["resolved" if res else "open"] += n
+            out["day"][day] += n
+    return out
+
+
+def _bars(c: Counter, total: int) -> list[str]:
+    top = max(c.values(), default=1)
+    return [
+        f"{name[:24]:<24} {n:>5} {n * 100 // total:>3}% {'█' * max(1, n * BAR_WIDTH // top)}"
+        for name, n in c.most_common()
+    ]
+
+
+def _trend(per_day: Counter, since: dt.date, today: dt.date) -> str:
+    days = [since + dt.timedelta(d) for d in range((today - since).days + 1)]
+    vals = [per_day.get(d, 0) for d in days]
+    top = max(vals) or 1
+    spark = "".join(SPARK[v * (len(SPARK) - 1) // top] for v in vals)
+    return f"{days[0]:%d %b} {spark} {days[-1]:%d %b}\npeak {top}/day • avg {sum(vals) / len(vals):.1f}/day"
+
+
+def render(c: Dict[str, Counter], since: dt.date, today: dt.date) -> str:
+    total = sum(c["subject"].values())
+    if not total:
+        return f"📊 No doubts since {since:%d %b %Y}."
+    s = c["status"]
+    lines = [
+        f"📊 Doubts since {since:%d %b %Y}: {total}",
+        f"public {s['public']} • private {s['private']} • "
+        f"resolved {s['resolved']} • open {s['open']}",
+        "",
+        "By subject", *_bars(c["subject"], total),
+        "",
+        "By nature", *_bars(c["nature"], total),
+        "",
+        "Per day", _trend(c["day"], since, today),
+    ]
+    return "```\n" + "\n".join(lines) + "\n```"
+
+
+# ───────────────────────── admin commands
+def _is_admin(u: Update, ctx: ContextTypes.DEFAULT_TYPE) -> bool:
+    return u.effective_user.id == ctx.bot_data.get("admin_id")
+
+
+async def cmd_stats(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    if not _is_admin(u, ctx):
+        return await u.message.reply_text("⛔ Admins only.")
+    arg = ctx.args[0].lower() if ctx.args else ""
+    if arg == "rebuild":
+        n = await asyncio.to_thread(rebuild)
+        return await u.message.reply_text(f"🔁 Recounted {n} doubt(s).")
+    if arg and not arg.isdigit():
+        return await u.message.reply_text("Usage: /doubt_stats [days] | rebuild")
+
+    days = min(int(arg or DEFAULT_DAYS), MAX_DAYS)
+    today = clock.utcnow().date()
+    since = today - dt.timedelta(days=max(1, days) - 1)
+    c = await asyncio.to_thread(collect, since)
+    await u.message.reply_text(render(c, since, today), parse_mode="Markdown")
+
+
+async def cmd_resolve(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    if not _is_admin(u, ctx):
+        return await u.message.reply_text("⛔ Admins only.")
+    arg = ctx.args[0].lstrip("#") if ctx.args else ""
+    if not arg.isdigit():
+        return await u.message.reply_text("Usage: /doubt_resolve ID")
+    with session_scope() as db:
+        d = db.get(Doubt, int(arg))
+        if d is None:
+            return await u.message.reply_text("ℹ️ No such doubt (or already archived).")
+        if d.resolved:
+            return await u.message.reply_text(f"ℹ️ Doubt #{d.id} is already resolved.")
+        d.resolved = True
+        key = (d.timestamp.date(), d.subject, d.nature, d.is_public)
+        bump(db, *key, resolved=False, delta=-1)
+        bump(db, *key, resolved=True)
+    await u.message.reply_text(f"✅ Doubt #{arg} resolved.")
+
+
+def register_handlers(app: Application):
+    commands.add(app, "doubt_stats",   cmd_stats,   menu=False)
+    commands.add(app, "doubt_resolve", cmd_resolve, menu=False)
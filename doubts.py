@@ -1,7 +1,6 @@
 # doubts.py
 
 import enum
-import datetime as dt
 from contextlib import contextmanager
 
 from telegram import (
@@ -19,6 +18,10 @@ from telegram.ext import (
     ContextTypes,
 )
 
+import clock
+import commands
+import doubt_stats
+import media
 from database import session_scope, Doubt, DoubtQuota
 
 # ────────── Conversation states ──────────
@@ -55,6 +58,9 @@ class Nature(str, enum.Enum):
     TEST_STRATEGY    = "Test-taking strategy"
     OTHER            = "Other / Custom"
 
+SUBJECTS = {s.value for s in Subject}
+NATURES  = {n.value for n in Nature}
+
 # ────────── Handlers ──────────
 async def cmd_doubt(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start /doubt: check quota, then ask subject."""
@@ -152,31 +158,45 @@ async def receive_content(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     nature  = context.user_data["nature"]
 
     # extract content
-    photo_id = None
-    if update.message.photo:
-        photo_id = update.message.photo[-1].file_id
+    photo = update.message.photo
+    if photo:
         content = update.message.caption or ""
     else:
         content = update.message.text or ""
 
-    timestamp = dt.datetime.utcnow()
+    # custom (typed) subject / nature, kept apart from the enum values
+    label = " / ".join(
+        x for x, known in ((subject, SUBJECTS), (nature, NATURES)) if x not in known
+    )[:100]
+    timestamp = clock.utcnow()
 
     # persist
     with session_scope() as db:
+        # same picture sent again → same media row
+        media_id = media.store(db, photo) if photo else None
         # save doubt
         d = Doubt(
             user_id=user_id,
             subject=subject,
             nature=nature,
+            label=label,
             content=content,
-            photo_id=photo_id,
+            media_id=media_id,
             timestamp=timestamp,
         )
         db.add(d)
-        # update quota
-        today = dt.date.today()
+        db.flush()
+        doubt_id = d.id
+        # analytics counter, same transaction as the insert
+        doubt_stats.bump(db, timestamp.date(), subject, nature, is_public=False, resolved=False)
+        # update quota (the day may have rolled over since /doubt)
+        today = clock.today()
         pk = (user_id, today)
         quota = db.get(DoubtQuota, pk)
+        if quota is None:
+            quota = DoubtQuota(user_id=user_id, date=today, public_count=0,
+                               private_count=0, last_reset=timestamp)
+            db.add(quota)
         quota.private_count += 1
         db.commit()
 
@@ -185,16 +205,16 @@ async def receive_content(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # notify admin
     admin_id = context.bot_data.get("admin_id")
     text = (
-        f"🆕 *New Doubt*\n"
+        f"🆕 *New Doubt* #{doubt_id}\n"
         f"• From: `{update.effective_user.id}`\n"
         f"• Subject: *{subject}*\n"
         f"• Nature: *{nature}*\n"
         f"• Content: {content}"
     )
-    if photo_id:
+    if media_id:
         await context.bot.send_photo(
             chat_id=admin_id,
-            photo=photo_id,
+            photo=media.file_id(media_id),
             caption=text,
             parse_mode="Markdown",
         )
@@ -204,6 +224,8 @@ async def receive_content(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             text=text,
             parse_mode="Markdown",
         )
+    if photo:
+        await media.save_thumb(context.bot, photo)
 
     return ConversationHandler.END
 
@@ -217,7 +239,7 @@ async def _check_quota(user_id: int, public: bool) -> str | None:
     Ensure user hasn't exceeded daily limit (3 private / 2 public).
     Returns an error message if over limit, else None.
     """
-    today = dt.date.today()
+    today = clock.today()
     with session_scope() as db:
         pk = (user_id, today)
         quota = db.get(DoubtQuota, pk)
@@ -228,7 +250,7 @@ async def _check_quota(user_id: int, public: bool) -> str | None:
                 date=today,
                 public_count=0,
                 private_count=0,
-                last_reset=dt.datetime.utcnow(),
+                last_reset=clock.utcnow(),
             )
             db.add(quota)
             db.commit()
@@ -260,3 +282,4 @@ def register_handlers(app: Application, admin_id: int):
         per_chat=False,
     )
     app.add_handler(conv)
+    commands.add(app, "doubt", None, "Raise a study doubt", owner=__name__)
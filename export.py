@@ -0,0 +1,208 @@
+# export.py
+"""
+Streaming bulk export of the bot's tables.
+
+  /export                   → every table as gzipped JSONL (admin only)
+  /export doubt csv         → one table, as gzipped CSV
+  python export.py doubt --format csv -o doubt.csv.gz
+
+Rows are read in primary-key order, one short query per chunk, and
+written straight to a temp file, so memory stays flat whatever the table
+size and no long read lock is held.  Files larger than the Bot API's
+50 MB upload cap are split into parts.  The DB work runs in a worker
+thread to keep the event loop responsive.
+"""
+
+from __future__ import annotations
+import argparse, asyncio, csv, datetime as dt, gzip, io, json, os, sys, tempfile
+from typing import BinaryIO, Dict, Iterator
+
+from sqlalchemy import Table, select, tuple_
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+import database
+import models
+
+CHUNK = 2_000
+FORMATS = ("jsonl", "csv")
+UPLOAD_LIMIT = 50 * 2**20          # Bot API send_document cap
+PART_BYTES   = 45 * 2**20          # split target, below UPLOAD_LIMIT
+
+# table name → SQLAlchemy table; extend as new tables are added
+TABLES: Dict[str, Table] = {
+    models.Doubt.__tablename__:        models.Doubt.__table__,
+    models.DoubtQuota.__tablename__:   models.DoubtQuota.__table__,
+    models.DoubtArchive.__tablename__: models.DoubtArchive.__table__,
+    models.DoubtStat.__tablename__:    models.DoubtStat.__table__,
+    models.Media.__tablename__:        models.Media.__table__,
+    models.StudyLog.__tablename__:     models.StudyLog.__table__,
+    models.ReportOptIn.__tablename__:  models.ReportOptIn.__table__,
+    models.Reminder.__tablename__:     models.Reminder.__table__,
+}
+
+
+# ───────────────────────── streaming core
+def iter_rows(table: Table, chunk: int = CHUNK) -> Iterator[dict]:
+    """
+    Yield rows as dicts in primary-key order, `chunk` rows per query.
+
+    Keyset pagination (pk > last … LIMIT chunk) with a fresh connection per
+    chunk: each read holds SQLite's shared lock for milliseconds, so bot
+    writes are never blocked by a slow consumer of this iterator.
+    """
+    pk = list(table.primary_key.columns)
+    key = pk[0] if len(pk) == 1 else tuple_(*pk)
+    last = None
+    while True:
+        q = select(table).order_by(*pk).limit(chunk)
+        if last is not None:
+            q = q.where(key > (last[0] if len(pk) == 1 else tuple_(*last)))
+        with database.engine.connect() as conn:
+            rows = conn.execute(q).mappings().all()
+        for row in rows:
+            yield dict(row)
+        if len(rows) < chunk:
+            return
+        last = [rows[-1][c.name] for c in pk]
+
+
+def _jsonable(v):
+    if isinstance(v, (dt.date, dt.datetime)):
+        return v.isoformat()
+    return v
+
+
+class _Sink:
+    """Gzipped CSV or JSONL writer on top of a binary file."""
+
+    def __init__(self, table: Table, fmt: str, fh: BinaryIO):
+        self.fh = fh
+        self.gz = gzip.GzipFile(fileobj=fh, mode="wb")
+        self.csv = None
+        if fmt == "csv":
+            self.text = io.TextIOWrapper(self.gz, encoding="utf-8", newline="")
+            self.csv = csv.DictWriter(self.text, fieldnames=[c.name for c in table.columns])
+            self.csv.writeheader()
+
+    def write(self, row: dict):
+        if self.csv:
+            self.csv.writerow(row)
+        else:
+            rec = {k: _jsonable(v) for k, v in row.items()}
+            self.gz.write(json.dumps(rec, ensure_ascii=False).encode() + b"\n")
+
+    def size(self) -> int:
+        """Compressed bytes written so far (lags by the compressor's buffer)."""
+        return self.fh.tell()
+
+    def close(self):
+        if self.csv:
+            self.text.flush()
+            self.text.detach()
+        self.gz.close()
+
+
+def write_table(table: Table, fmt: str, fh: BinaryIO) -> int:
+    """Stream `table` into binary file `fh` (gzipped); returns the row count."""
+    sink, n = _Sink(table, fmt, fh), 0
+    for row in iter_rows(table):
+        sink.write(row)
+        n += 1
+    sink.close()
+    return n
+
+
+def _filename(name: str, fmt: str, part: int = 0) -> str:
+    stamp = clock.utcnow().strftime("%Y%m%d-%H%M%S")
+    return f"{name}-{stamp}{f'.part{part}' if part else ''}.{fmt}.gz"
+
+
+def _export_parts(name: str, fmt: str) -> tuple[list[tuple[str, str, int]], int]:
+    """Write `name` to temp files of ~PART_BYTES each: ([(path, filename, rows)], total)."""
+    table, parts = TABLES[name], []
+
+    def start() -> _Sink:
+        fd, path = tempfile.mkstemp(suffix=".gz")
+        parts.append([path, "", 0])
+        return _Sink(table, fmt, os.fdopen(fd, "wb"))
+
+    def finish(sink: _Sink):
+        sink.close()
+        sink.fh.close()
+
+    sink = start()
+    for row in iter_rows(table):
+        if sink.size() >= PART_BYTES:
+            finish(sink)
+            sink = start()
+        sink.write(row)
+        parts[-1][2] += 1
+    finish(sink)
+
+    for i, p in enumerate(parts, 1):
+        p[1] = _filename(name, fmt, i if len(parts) > 1 else 0)
+    return [tuple(p) for p in parts], sum(p[2] for p in parts)
+
+
+# ───────────────────────── admin command
+async def cmd_export(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    if u.effective_user.id != ctx.bot_data.get("admin_id"):
+        return await u.message.reply_text("⛔ Admins only.")
+
+    args = [a.lower() for a in ctx.args or []]
+    fmt = next((a for a in args if a in FORMATS), "jsonl")
+    names = [a for a in args if a in TABLES] or list(TABLES)
+    bad = [a for a in args if a not in TABLES and a not in FORMATS]
+    if bad:
+        return await u.message.reply_text(
+            f"❌ Unknown table/format: {', '.join(bad)}\n"
+            f"Tables: {', '.join(TABLES)} • formats: {', '.join(FORMATS)}"
+        )
+
+    await u.message.reply_text(f"📦 Exporting {', '.join(names)} as {fmt}…")
+    for name in names:
+        parts, n = await asyncio.to_thread(_export_parts, name, fmt)
+        for i, (path, filename, rows) in enumerate(parts, 1):
+            of = f" (part {i}/{len(parts)})" if len(parts) > 1 else ""
+            try:
+                if os.path.getsize(path) > UPLOAD_LIMIT:
+                    raise ValueError(f"{os.path.getsize(path) >> 20} MB is over the upload limit")
+                with open(path, "rb") as fh:
+                    await ctx.bot.send_document(
+                        u.effective_chat.id,
+                        document=fh,
+                        filename=filename,
+                        caption=f"{name}{of}: {rows} of {n} rows",
+                    )
+            except Exception as e:
+                await u.message.reply_text(f"❌ {filename} not sent: {e}")
+            finally:
+                os.remove(path)
+
+
+def register_handlers(app: Application):
+    commands.add(app, "export", cmd_export, menu=False)
+
+
+# ───────────────────────── CLI
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Stream a table out of the bot DB.")
+    p.add_argument("table", choices=list(TABLES))
+    p.add_argument("--format", choices=FORMATS, default="jsonl")
+    p.add_argument("-o", "--output", help="file to write (default: stdout)")
+    a = p.parse_args(argv)
+
+    if a.output:
+        with open(a.output, "wb") as fh:
+            n = write_table(TABLES[a.table], a.format, fh)
+    else:
+        n = write_table(TABLES[a.table], a.format, sys.stdout.buffer)
+    print(f"{a.table}: {n} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
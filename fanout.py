@@ -0,0 +1,124 @@
+# fanout.py
+"""
+Outbound helpers:
+  fan_out     – run one coroutine per target with at most `limit` in flight,
+                without materialising a task per target up front
+  bulk        – rate-limited background sender for mass messages
+"""
+
+from __future__ import annotations
+import asyncio, logging, os
+from typing import Awaitable, Callable, Dict, Iterable, TypeVar
+
+from telegram.error import RetryAfter
+
+import clock
+
+T = TypeVar("T")
+
+FANOUT_LIMIT = int(os.getenv("FANOUT_LIMIT", "20"))
+BULK_RATE    = float(os.getenv("BULK_RATE", "20"))     # messages / second
+
+log = logging.getLogger(__name__)
+
+
+async def fan_out(
+    fn: Callable[[T], Awaitable[object]],
+    targets: Iterable[T],
+    limit: int = FANOUT_LIMIT,
+) -> Dict[T, BaseException]:
+    """Await fn(t) for every target; returns {target: exception} for failures."""
+    it = iter(targets)
+    failed: Dict[T, BaseException] = {}
+
+    async def worker():
+        for t in it:                  # workers share one iterator
+            try:
+                await fn(t)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failed[t] = e
+
+    await asyncio.gather(*(worker() for _ in range(max(1, limit))))
+    return failed
+
+
+class BulkSender:
+    """
+    Background queue for low-priority mass messages (reports, digests).
+
+    Sends at most `rate` messages/s – well under Telegram's ~30/s global
+    limit, leaving headroom for interactive replies – and honours
+    RetryAfter.  The queue is bounded, so producers are paced too.
+
+    Time-sensitive messages (reminders) go to a separate `urgent` queue
+    that is always emptied first, so they never wait behind a weekly
+    report run.
+    """
+
+    def __init__(self, rate: float = BULK_RATE, maxsize: int = 1_000):
+        self.rate  = rate
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.urgent: asyncio.Queue = asyncio.Queue()
+        self.sent = self.failed = 0
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def start(self, bot):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(bot))
+
+    async def enqueue(self, chat_id: int, text: str, *, urgent: bool = False, **kw):
+        if urgent:
+            self.urgent.put_nowait((chat_id, text, kw))
+        else:
+            await self.queue.put((chat_id, text, kw))
+        self._wake.set()
+
+    def pending(self) -> int:
+        return self.urgent.qsize() + self.queue.qsize()
+
+    async def drain(self):
+        """Wait until everything queued so far has been sent (or has failed)."""
+        await self.urgent.join()
+        await self.queue.join()
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, bot):
+        gap = 1.0 / self.rate
+        while True:
+            if self.urgent.empty() and self.queue.empty():
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            q = self.queue if self.urgent.empty() else self.urgent
+            chat_id, text, kw = q.get_nowait()
+            try:
+                while True:
+                    try:
+                        await bot.send_message(chat_id, text, **kw)
+                        self.sent += 1
+                        break
+                    except RetryAfter as e:
+                        await clock.sleep(retry_after(e))
+                    except Exception as e:
+                        self.failed += 1
+                        log.info("bulk send to %s failed: %s", chat_id, e)
+                        break
+            finally:
+                q.task_done()
+            await clock.sleep(gap)
+
+
+def retry_after(e: RetryAfter) -> float:
+    """Seconds Telegram asked us to wait (int or timedelta depending on PTB)."""
+    v = e.retry_after
+    return v.total_seconds() if hasattr(v, "total_seconds") else float(v)
+
+
+bulk = BulkSender()
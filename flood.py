@@ -0,0 +1,114 @@
+# flood.py
+"""
+Per-user and per-chat flood control, checked before every other handler.
+
+Each key keeps a sliding-window counter: the hits of the current and the
+previous fixed window, the previous one weighted by how much of it still
+overlaps the sliding window.  That is three ints per key, O(1) per update,
+and idle keys are swept out once they are two windows old.
+
+Limits come from FLOOD_USER / FLOOD_CHAT as "<hits>/<seconds>".
+"""
+
+from __future__ import annotations
+import os
+from typing import Dict, List
+
+from telegram import Update
+from telegram.ext import (
+    Application,
+    ApplicationHandlerStop,
+    ContextTypes,
+    TypeHandler,
+)
+
+import clock
+
+SWEEP_EVERY = 1_024     # updates between sweeps of idle keys
+
+
+def _parse(spec: str) -> tuple[int, float]:
+    hits, secs = spec.split("/", 1)
+    return int(hits), float(secs)
+
+
+class SlidingWindow:
+    """Approximate sliding-window counter keyed by int id."""
+
+    __slots__ = ("limit", "window", "_state", "_calls")
+
+    def __init__(self, limit: int, window: float):
+        self.limit  = limit
+        self.window = window
+        self._state: Dict[int, List[int]] = {}   # key → [win_idx, prev, cur, warned_idx]
+        self._calls = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def hit(self, key: int, now: float) -> bool:
+        """Count one hit for `key`; False if it is over the limit."""
+        self._calls += 1
+        if self._calls % SWEEP_EVERY == 0:
+            self.sweep(now)
+
+        idx = int(now // self.window)
+        st = self._state.get(key)
+        if st is None:
+            self._state[key] = [idx, 0, 1, -1]
+            return True
+        if st[0] != idx:
+            st[1] = st[2] if st[0] == idx - 1 else 0
+            st[2] = 0
+            st[0] = idx
+        overlap = 1.0 - (now / self.window - idx)
+        if st[1] * overlap + st[2] >= self.limit:
+            return False
+        st[2] += 1
+        return True
+
+    def first_rejection(self, key: int, now: float) -> bool:
+        """True once per window, so the user is warned only once."""
+        st = self._state.get(key)
+        idx = int(now // self.window)
+        if st is None or st[3] == idx:
+            return False
+        st[3] = idx
+        return True
+
+    def sweep(self, now: float) -> None:
+        idx = int(now // self.window)
+        stale = [k for k, st in self._state.items() if st[0] < idx - 1]
+        for k in stale:
+            del self._state[k]
+
+
+per_user = SlidingWindow(*_parse(os.getenv("FLOOD_USER", "8/10")))
+per_chat = SlidingWindow(*_parse(os.getenv("FLOOD_CHAT", "30/10")))
+
+
+# ───────────────────────── guard
+async def _guard(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    user, chat = update.effective_user, update.effective_chat
+    if user is None or user.id == ctx.bot_data.get("admin_id"):
+        return
+    now = clock.monotonic()
+
+    if per_user.hit(user.id, now) and (chat is None or per_chat.hit(chat.id, now)):
+        return
+
+    if per_user.first_rejection(user.id, now):
+        if update.callback_query:
+            await update.callback_query.answer("⏳ Slow down a little.", show_alert=True)
+        elif update.effective_message:
+            await update.effective_message.reply_text(
+                "⏳ Too many requests – please wait a few seconds."
+            )
+    elif update.callback_query:
+        await update.callback_query.answer()
+    raise ApplicationHandlerStop
+
+
+def register_handlers(app: Application):
+    # group -1 runs before every handler in the default group 0
+    app.add_handler(TypeHandler(Update, _guard), group=-1)
@@ -0,0 +1,252 @@
+# leaderboard.py
+"""
+Study-time leaderboards.
+
+  /leaderboard [day|week] [global] [TaskType]
+
+Every finished study block is logged to `study_log` and added to the live
+boards it belongs to: global and (in groups) per chat, for today and this
+ISO week, overall and per TaskType.  A board ranks users by whole minutes
+in a Fenwick tree over the minute buckets, so an update, a "my rank" query
+and each top-K entry are O(log M) with M = minutes in a week – nothing is
+ever sorted over the full user base.  The tree starts small and doubles
+only when someone's score outgrows it, so quiet boards stay tiny.
+"""
+
+from __future__ import annotations
+import datetime as dt, heapq
+from array import array
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import func, select
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+from database import session_scope, StudyLog
+
+MAX_MIN = 7 * 24 * 60          # a week, in minutes – the largest score
+TOP_K   = 10
+
+BoardKey = Tuple[int, str, str]     # (chat_id or 0, period, task_type or "")
+
+
+class Board:
+    """Users ranked by minutes; ties share a rank."""
+
+    __slots__ = ("secs", "tree", "buckets", "n")
+
+    def __init__(self):
+        self.secs: Dict[int, int] = {}             # user → seconds
+        self.tree = array("i", [0]) * 64           # Fenwick over minute buckets
+        self.buckets: Dict[int, Set[int]] = {}     # minute → users
+        self.n = 0
+
+    def _grow(self, minute: int):
+        size = len(self.tree)
+        while size < minute + 2:
+            size *= 2
+        self.tree = array("i", [0]) * min(size, MAX_MIN + 2)
+        for m, users in self.buckets.items():
+            self._bump(m, len(users))
+
+    # Fenwick primitives (index = minute + 1)
+    def _bump(self, minute: int, d: int):
+        i = minute + 1
+        while i < len(self.tree):
+            self.tree[i] += d
+            i += i & -i
+
+    def _below(self, minute: int) -> int:
+        """How many users score fewer than `minute` minutes."""
+        i, s = minute, 0
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def _kth(self, k: int) -> int:
+        """Minute bucket holding the k-th lowest score (1-based)."""
+        pos, step = 0, 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos                                 # minute = index - 1
+
+    def add(self, uid: int, seconds: int):
+        old = self.secs.get(uid)
+        new = (old or 0) + seconds
+        self.secs[uid] = new
+        m_new = min(new // 60, MAX_MIN)
+        if old is None:
+            self.n += 1
+        else:
+            m_old = min(old // 60, MAX_MIN)
+            if m_old == m_new:
+                return
+            self._bump(m_old, -1)
+            b = self.buckets[m_old]
+            b.discard(uid)
+            if not b:
+                del self.buckets[m_old]
+        if m_new + 1 >= len(self.tree):
+            self._grow(m_new)
+        self._bump(m_new, 1)
+        self.buckets.setdefault(m_new, set()).add(uid)
+
+    def rank(self, uid: int) -> int | None:
+        s = self.secs.get(uid)
+        if s is None:
+            return None
+        m = min(s // 60, MAX_MIN)
+        return self.n - self._below(m + 1) + 1
+
+    def top(self, k: int = TOP_K) -> List[Tuple[int, int, int]]:
+        """[(rank, user, seconds)] best first."""
+        out: List[Tuple[int, int, int]] = []
+        j = self.n
+        while j > 0 and len(out) < k:
+            minute = self._kth(j)
+            users = self.buckets[minute]
+            rank = self.n - j + 1
+            for uid in heapq.nlargest(k - len(out), users, key=self.secs.__getitem__):
+                out.append((rank, uid, self.secs[uid]))
+            j -= len(users)
+        return out
+
+
+boards: Dict[BoardKey, Board] = {}
+names:  Dict[int, str] = {}
+
+
+# ───────────────────────── periods
+def _periods(when: dt.datetime) -> Tuple[str, str]:
+    y, w, _ = when.isocalendar()
+    return when.date().isoformat(), f"{y}-W{w:02d}"
+
+
+_live: Tuple[str, str] = ("", "")
+
+
+def _prune(now: dt.datetime):
+    """Forget boards of past days/weeks (scans only when the day rolls over)."""
+    global _live
+    live = _periods(now)
+    if live == _live:
+        return
+    _live = live
+    for key in [k for k in boards if k[1] not in live]:
+        del boards[key]
+
+
+def _apply(uid: int, cid: int, task_type: str | None, seconds: int, when: dt.datetime):
+    scopes = (0, cid) if cid < 0 else (0,)         # negative id = group chat
+    types  = ("", task_type) if task_type else ("",)
+    for period in _periods(when):
+        for scope in scopes:
+            for tt in types:
+                boards.setdefault((scope, period, tt), Board()).add(uid, seconds)
+
+
+# ───────────────────────── recording
+def record_many(entries: Iterable[Tuple[int, int, str | None, str | None, int]]):
+    """Log (user_id, chat_id, name, task_type, seconds) blocks and rank them."""
+    now = clock.utcnow()
+    rows = [e for e in entries if e[4] > 0]
+    if not rows:
+        return
+    with session_scope() as db:
+        db.add_all(
+            StudyLog(user_id=u, chat_id=c, name=n, task_type=t, seconds=s, ended_at=now)
+            for u, c, n, t, s in rows
+        )
+    _prune(now)
+    for u, c, n, t, s in rows:
+        if n:
+            names[u] = n
+        _apply(u, c, t, s, now)
+
+
+def record(uid: int, cid: int, name: str | None, task_type: str | None, seconds: int):
+    record_many([(uid, cid, name, task_type, seconds)])
+
+
+def _restore():
+    """Rebuild this week's boards from study_log (one grouped query)."""
+    global _live
+    now = clock.utcnow()
+    week_start = dt.datetime.combine(
+        now.date() - dt.timedelta(days=now.weekday()), dt.time()
+    )
+    day = func.date(StudyLog.ended_at)
+    with session_scope() as db:
+        rows = db.execute(
+            select(
+                StudyLog.user_id, StudyLog.chat_id, StudyLog.task_type, day,
+                func.sum(StudyLog.seconds), func.max(StudyLog.name),
+            )
+            .where(StudyLog.ended_at >= week_start)
+            .group_by(StudyLog.user_id, StudyLog.chat_id, StudyLog.task_type, day)
+        ).all()
+    boards.clear()
+    _live = ("", "")
+    for uid, cid, tt, d, secs, name in rows:
+        if name:
+            names[uid] = name
+        when = dt.datetime.combine(dt.date.fromisoformat(str(d)), dt.time())
+        _apply(uid, cid, tt, int(secs), when)
+    _prune(now)
+
+
+async def on_startup(app: Application):
+    _restore()
+
+
+# ───────────────────────── command
+def _fmt(s: int) -> str:
+    h, m = divmod(s // 60, 60)
+    return f"{h}h {m:02d}m"
+
+
+async def cmd_leaderboard(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    from study_tasks import TaskType      # study_tasks imports this module
+
+    args = [a.lower() for a in ctx.args or []]
+    period_i = 0 if "day" in args or "today" in args else 1
+    cid = u.effective_chat.id
+    scope = 0 if "global" in args or cid >= 0 else cid
+    tt = next(
+        (t.value for t in TaskType
+         if t.name.lower() in args or t.value.lower() in args),
+        "",
+    )
+
+    now = clock.utcnow()
+    _prune(now)
+    period = _periods(now)[period_i]
+    board = boards.get((scope, period, tt))
+    title = (
+        f"🏆 {'Today' if period_i == 0 else 'This week'}"
+        f"{' • ' + tt if tt else ''}"
+        f"{' • this group' if scope else ''}"
+    )
+    if not board or not board.n:
+        return await u.message.reply_text(f"{title}\nNo study logged yet.")
+
+    uid = u.effective_user.id
+    lines = [title]
+    for rank, user, secs in board.top(TOP_K):
+        who = names.get(user, f"user {user}")
+        lines.append(f"{rank}. {who} – {_fmt(secs)}")
+    r = board.rank(uid)
+    if r:
+        lines.append(f"\nYou: #{r} of {board.n} – {_fmt(board.secs[uid])}")
+    await u.message.reply_text("\n".join(lines))
+
+
+def register_handlers(app: Application):
+    commands.add(app, "leaderboard", cmd_leaderboard, "Study-time leaderboard")
@@ -0,0 +1,90 @@
+# lifecycle.py
+"""
+Webhook server lifecycle with an ordered, timed shutdown.
+
+Replaces `run_webhook`, which with stop_signals=None let SIGTERM kill the
+process mid-update.  On SIGTERM/SIGINT the stages run in order, each
+logged with its duration:
+
+  intake      stop the webhook server – no new updates are accepted
+  handlers    finish queued and in-flight updates (≤ HANDLER_GRACE s)
+  checkpoint  snapshot live state, cancel the background loops, save it
+  outbound    drain the bulk-send queues until SHUTDOWN_GRACE runs out
+
+SHUTDOWN_GRACE is the whole budget and must stay below the platform's
+kill timeout (Render sends SIGKILL 30 s after SIGTERM by default).
+"""
+
+from __future__ import annotations
+import asyncio, logging, os, signal
+from types import ModuleType
+from typing import Awaitable, Iterable
+
+from telegram.ext import Application
+
+import checkpoint
+import clock
+from fanout import bulk
+
+log = logging.getLogger(__name__)
+
+SHUTDOWN_GRACE = float(os.getenv("SHUTDOWN_GRACE", "25"))
+HANDLER_GRACE  = float(os.getenv("SHUTDOWN_HANDLER_GRACE", "10"))
+
+
+async def _stage(name: str, aw: Awaitable, timeout: float | None = None) -> bool:
+    """Await one stage; False if it timed out or failed."""
+    t0, ok = clock.monotonic(), True
+    try:
+        await asyncio.wait_for(aw, timeout)
+    except asyncio.TimeoutError:
+        ok = False
+        log.warning("shutdown: %s timed out after %.1f s", name, timeout)
+    except Exception:
+        ok = False
+        log.exception("shutdown: %s failed", name)
+    log.info("shutdown: %-10s %6.2f s", name, clock.monotonic() - t0)
+    return ok
+
+
+async def _checkpoint(loops: Iterable[ModuleType]):
+    rows = checkpoint.collect()
+    for mod in loops:                 # same tick as collect(): nothing moves
+        mod.on_shutdown()
+    await asyncio.to_thread(checkpoint.write, rows)
+    log.info("shutdown: checkpointed %d live session(s)", len(rows))
+
+
+async def drain(app: Application, loops: Iterable[ModuleType]):
+    t0 = clock.monotonic()
+    deadline = t0 + SHUTDOWN_GRACE
+
+    def left() -> float:
+        return max(0.0, deadline - clock.monotonic())
+
+    await _stage("intake", app.updater.stop())
+    if not await _stage("handlers", app.stop(), min(HANDLER_GRACE, left())):
+        # app.stop() already flipped `running`, so shutdown() still works
+        log.warning("shutdown: %d queued update(s) abandoned", app.update_queue.qsize())
+    await _stage("checkpoint", _checkpoint(loops))
+    if not await _stage("outbound", bulk.drain(), left()):
+        log.warning("shutdown: %d bulk message(s) not sent", bulk.pending())
+    bulk.stop()
+    log.info("shutdown: total      %6.2f s", clock.monotonic() - t0)
+
+
+async def serve(app: Application, loops: Iterable[ModuleType], **webhook):
+    """Run the webhook until SIGTERM/SIGINT, then drain (see module doc)."""
+    stop = asyncio.Event()
+    ev_loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        ev_loop.add_signal_handler(sig, stop.set)
+
+    async with app:                               # initialize() … shutdown()
+        if app.post_init:
+            await app.post_init(app)              # run_webhook used to call it
+        await app.updater.start_webhook(**webhook)
+        await app.start()
+        await stop.wait()
+        log.info("shutdown: signal received")
+        await drain(app, loops)
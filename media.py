@@ -0,0 +1,111 @@
+# media.py
+"""
+Photos attached to doubts.
+
+Telegram gives every picture a `file_unique_id` that stays the same when
+it is forwarded or sent again, so the `media` table is keyed by it: a
+screenshot shared by twenty students is one row, referenced by twenty
+doubts.  The reusable `file_id` (what send_photo needs to re-send without
+re-uploading) is kept in the row; `file_id()` caches committed rows in a
+small in-memory LRU.
+
+If MEDIA_THUMB_DIR is set, the smallest size Telegram offers is saved
+there once per picture as <file_unique_id>.jpg.
+"""
+
+from __future__ import annotations
+import logging, os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy.orm import Session
+from telegram import PhotoSize
+
+from database import session_scope, Media
+
+log = logging.getLogger(__name__)
+
+CACHE_SIZE = int(os.getenv("MEDIA_CACHE_SIZE", "2048"))
+THUMB_DIR  = Path(os.environ["MEDIA_THUMB_DIR"]) if os.getenv("MEDIA_THUMB_DIR") else None
+
+
+class _LRU:
+    """file_unique_id → file_id, least recently used dropped first."""
+
+    __slots__ = ("size", "_d")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._d: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        v = self._d.get(key)
+        if v is not None:
+            self._d.move_to_end(key)
+        return v
+
+    def put(self, key: str, value: str):
+        self._d[key] = value
+        self._d.move_to_end(key)
+        if len(self._d) > self.size:
+            self._d.popitem(last=False)
+
+
+_file_ids = _LRU(CACHE_SIZE)
+
+
+# ───────────────────────── store / look up
+def store(db: Session, photo: Sequence[PhotoSize]) -> str:
+    """
+    Record the largest size of `photo` inside the caller's transaction;
+    returns its file_unique_id (the Doubt.media_id).
+    """
+    p = photo[-1]
+    uid = p.file_unique_id
+    # always ask the DB: the cache may only hold committed rows, and this
+    # transaction can still roll back
+    row = db.get(Media, uid)
+    if row is None:
+        db.add(Media(
+            file_unique_id=uid, file_id=p.file_id,
+            width=p.width, height=p.height, file_size=p.file_size,
+        ))
+    elif row.file_id != p.file_id:
+        row.file_id = p.file_id
+    return uid
+
+
+def file_id(unique_id: str) -> str | None:
+    """Reusable file_id for send_photo, from the cache or the media table."""
+    fid = _file_ids.get(unique_id)
+    if fid is None:
+        with session_scope() as db:
+            row = db.get(Media, unique_id)
+            fid = row.file_id if row else None
+        if fid:
+            _file_ids.put(unique_id, fid)
+    return fid
+
+
+# ───────────────────────── thumbnails
+def thumb_path(unique_id: str) -> Path | None:
+    if THUMB_DIR is None:
+        return None
+    p = THUMB_DIR / f"{unique_id}.jpg"
+    return p if p.exists() else None
+
+
+async def save_thumb(bot, photo: Sequence[PhotoSize]):
+    """Download the smallest size once per picture (no-op without MEDIA_THUMB_DIR)."""
+    if THUMB_DIR is None:
+        return
+    path = THUMB_DIR / f"{photo[-1].file_unique_id}.jpg"
+    if path.exists():
+        return
+    try:
+        THUMB_DIR.mkdir(parents=True, exist_ok=True)
+        f = await bot.get_file(photo[0].file_id)
+        await f.download_to_drive(path)
+    except Exception as e:
+        log.warning("thumbnail for %s not saved: %s", path.stem, e)
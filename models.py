@@ -8,6 +8,8 @@ from sqlalchemy import (
     Date,
     DateTime,
     Boolean,
+    Index,
+    ForeignKey,
 )
 from sqlalchemy.orm import declarative_base
 
@@ -24,6 +26,50 @@ class Doubt(Base):
     timestamp = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
     is_public = Column(Boolean, default=False, nullable=False)
     resolved = Column(Boolean, default=False, nullable=False)
+    media_id = Column(String(64), ForeignKey("media.file_unique_id"), index=True, nullable=True)
+
+    # serves the archival sweep (resolved AND timestamp < cutoff);
+    # AUTOINCREMENT: ids of archived doubts are never handed out again
+    __table_args__ = (
+        Index("ix_doubt_resolved_ts", "resolved", "timestamp"),
+        {"sqlite_autoincrement": True},
+    )
+
+class Media(Base):
+    """A Telegram photo, stored once however many doubts attach it."""
+    __tablename__ = "media"
+    file_unique_id = Column(String(64), primary_key=True)   # same picture ⇒ same id
+    file_id = Column(String(200), nullable=False)            # reusable, for re-sending
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    file_size = Column(Integer, nullable=True)
+    created = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+
+class DoubtArchive(Base):
+    """Cold copy of resolved doubts moved out of `doubt` by archive.py."""
+    __tablename__ = "doubt_archive"
+    id = Column(Integer, primary_key=True)
+    doubt_id = Column(Integer, index=True, nullable=True)   # id it had in `doubt`
+    user_id = Column(Integer, index=True, nullable=False)
+    subject = Column(String(50), nullable=False)
+    nature = Column(String(50), nullable=False)
+    label = Column(String(100), nullable=False)
+    content = Column(Text, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    is_public = Column(Boolean, default=False, nullable=False)
+    resolved = Column(Boolean, default=True, nullable=False)
+    media_id = Column(String(64), nullable=True)
+    archived_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+
+class DoubtStat(Base):
+    """Materialised doubt counts per day and category (see doubt_stats.py)."""
+    __tablename__ = "doubt_stat"
+    day = Column(Date, primary_key=True)               # UTC date of submission
+    subject = Column(String(50), primary_key=True)     # custom text → "Other / Custom"
+    nature = Column(String(50), primary_key=True)
+    is_public = Column(Boolean, primary_key=True)
+    resolved = Column(Boolean, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
 
 class DoubtQuota(Base):
     __tablename__ = "doubt_quota"
@@ -33,3 +79,39 @@ class DoubtQuota(Base):
     public_count = Column(Integer, default=0, nullable=False)
     private_count = Column(Integer, default=0, nullable=False)
     last_reset = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+
+class StudyLog(Base):
+    """One finished study block (stopwatch task or Pomodoro work phase)."""
+    __tablename__ = "study_log"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True, nullable=False)
+    chat_id = Column(Integer, nullable=False)
+    name = Column(String(64), nullable=True)        # display name at the time
+    task_type = Column(String(50), nullable=True)   # TaskType value; None = Pomodoro
+    seconds = Column(Integer, nullable=False)
+    ended_at = Column(DateTime, default=dt.datetime.utcnow, index=True, nullable=False)
+
+class ReportOptIn(Base):
+    """Users who receive the weekly study report."""
+    __tablename__ = "report_opt_in"
+    user_id = Column(Integer, primary_key=True)
+    created = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
+
+class Reminder(Base):
+    """Daily reminder; next_fire (UTC) is what the scheduler scans by."""
+    __tablename__ = "reminder"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, index=True, nullable=False)
+    chat_id = Column(Integer, nullable=False)
+    hour = Column(Integer, nullable=False)          # local time of day
+    minute = Column(Integer, nullable=False)
+    text = Column(String(200), nullable=False)
+    next_fire = Column(DateTime, index=True, nullable=False)
+
+class Checkpoint(Base):
+    """Live in-memory state saved on shutdown and restored once on startup."""
+    __tablename__ = "checkpoint"
+    kind = Column(String(32), primary_key=True)     # owning module
+    key = Column(String(64), primary_key=True)      # chat/user id or room name
+    data = Column(Text, nullable=False)             # JSON
+    saved_at = Column(DateTime, default=dt.datetime.utcnow, nullable=False)
@@ -0,0 +1,198 @@
+# reminders.py
+"""
+Daily study reminders, persisted in the `reminder` table.
+
+  /remind 19:00 [text]      → remind me every day at 19:00 (IST by default)
+  /reminders                → list mine
+  /remind_del ID|all        → delete
+
+The scheduler never loads every reminder: it asks the next_fire index for
+the ones due within WINDOW (at most BATCH rows), fires them through the
+bulk sender's urgent queue – ahead of any weekly report run – and writes
+back their next occurrence.  After downtime a reminder missed by less
+than GRACE fires once, late; older misses are skipped.  Either way it is rolled forward to its next future time.
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt, logging, os
+from typing import List, Tuple
+
+from sqlalchemy import func, select, update
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+from database import session_scope, Reminder
+from fanout import bulk
+
+log = logging.getLogger(__name__)
+
+UTC_OFFSET = dt.timedelta(minutes=int(os.getenv("REMINDER_UTC_OFFSET_MIN", "330")))
+WINDOW     = dt.timedelta(seconds=60)
+GRACE      = dt.timedelta(hours=1)
+BATCH      = 500
+PER_USER   = 5
+DEFAULT_TEXT = "⏰ Study time! /checkin or /task_start"
+
+_loop: asyncio.Task | None = None
+_wake = asyncio.Event()          # set when a reminder is added/removed
+
+Due = Tuple[int, int, int, int, str, dt.datetime]   # id, chat, h, m, text, next_fire
+
+
+# ───────────────────────── time helpers
+def next_fire(hour: int, minute: int, after: dt.datetime) -> dt.datetime:
+    """First UTC instant strictly after `after` that is hour:minute local."""
+    local = after + UTC_OFFSET
+    cand = dt.datetime.combine(local.date(), dt.time(hour, minute))
+    if cand <= local:
+        cand += dt.timedelta(days=1)
+    return cand - UTC_OFFSET
+
+
+def _parse_hhmm(s: str) -> Tuple[int, int] | None:
+    try:
+        t = dt.time.fromisoformat(s if len(s) > 4 else s.zfill(5))
+    except ValueError:
+        return None
+    return t.hour, t.minute
+
+
+# ───────────────────────── DB side (run in a thread)
+def _due(until: dt.datetime) -> List[Due]:
+    with session_scope() as db:
+        return [
+            tuple(r) for r in db.execute(
+                select(Reminder.id, Reminder.chat_id, Reminder.hour,
+                       Reminder.minute, Reminder.text, Reminder.next_fire)
+                .where(Reminder.next_fire <= until)
+                .order_by(Reminder.next_fire)
+                .limit(BATCH)
+            )
+        ]
+
+
+def _earliest() -> dt.datetime | None:
+    with session_scope() as db:
+        return db.scalar(select(func.min(Reminder.next_fire)))
+
+
+def _reschedule(rows: List[Tuple[int, dt.datetime, dt.datetime]]):
+    """(id, old, new) – skipped if the user changed the row meanwhile."""
+    with session_scope() as db:
+        for rid, old, new in rows:
+            db.execute(
+                update(Reminder)
+                .where(Reminder.id == rid, Reminder.next_fire == old)
+                .values(next_fire=new)
+            )
+
+
+# ───────────────────────── scheduler
+async def _sleep_or_wake(seconds: float):
+    _wake.clear()
+    waiter = asyncio.ensure_future(_wake.wait())
+    nap = asyncio.ensure_future(clock.sleep(max(0.0, seconds)))
+    try:
+        await asyncio.wait((waiter, nap), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+        nap.cancel()
+
+
+async def _scheduler():
+    while True:
+        try:
+            now = clock.utcnow()
+            rows = await asyncio.to_thread(_due, now + WINDOW)
+            if not rows:
+                nxt = await asyncio.to_thread(_earliest)
+                wait = WINDOW.total_seconds() if nxt is None else \
+                    min(WINDOW.total_seconds(), (nxt - now).total_seconds())
+                await _sleep_or_wake(wait)
+                continue
+
+            done = []
+            for rid, chat_id, h, m, text, when in rows:
+                delay = (when - clock.utcnow()).total_seconds()
+                if delay > 0:
+                    await clock.sleep(delay)
+                now = clock.utcnow()
+                if now - when <= GRACE:
+                    await bulk.enqueue(chat_id, text, urgent=True)
+                done.append((rid, when, next_fire(h, m, now)))
+            await asyncio.to_thread(_reschedule, done)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception("reminder scheduler error")
+            await clock.sleep(WINDOW.total_seconds())
+
+
+async def on_startup(app: Application):
+    global _loop
+    bulk.start(app.bot)
+    _loop = asyncio.create_task(_scheduler())
+
+
+def on_shutdown():
+    if _loop:
+        _loop.cancel()
+
+
+# ───────────────────────── commands
+async def cmd_remind(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    hm = _parse_hhmm(ctx.args[0]) if ctx.args else None
+    if not hm:
+        return await u.message.reply_text("Usage: /remind HH:MM [text]")
+    text = " ".join(ctx.args[1:])[:200] or DEFAULT_TEXT
+    uid = u.effective_user.id
+    with session_scope() as db:
+        n = db.scalar(select(func.count()).where(Reminder.user_id == uid))
+        if n >= PER_USER:
+            return await u.message.reply_text(f"❌ Max {PER_USER} reminders – /remind_del one first.")
+        r = Reminder(
+            user_id=uid, chat_id=u.effective_chat.id, hour=hm[0], minute=hm[1],
+            text=text, next_fire=next_fire(*hm, clock.utcnow()),
+        )
+        db.add(r)
+        db.flush()
+        rid = r.id
+    _wake.set()
+    await u.message.reply_text(f"✅ Reminder #{rid} set for {hm[0]:02d}:{hm[1]:02d} daily.")
+
+
+async def cmd_list(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    with session_scope() as db:
+        rows = db.execute(
+            select(Reminder.id, Reminder.hour, Reminder.minute, Reminder.text)
+            .where(Reminder.user_id == u.effective_user.id)
+            .order_by(Reminder.hour, Reminder.minute)
+        ).all()
+    if not rows:
+        return await u.message.reply_text("No reminders. /remind 19:00 to add one.")
+    await u.message.reply_text(
+        "\n".join(f"#{i} • {h:02d}:{m:02d} • {t}" for i, h, m, t in rows)
+    )
+
+
+async def cmd_delete(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    arg = ctx.args[0].lower().lstrip("#") if ctx.args else ""
+    q = select(Reminder).where(Reminder.user_id == u.effective_user.id)
+    if arg != "all":
+        if not arg.isdigit():
+            return await u.message.reply_text("Usage: /remind_del ID|all")
+        q = q.where(Reminder.id == int(arg))
+    with session_scope() as db:
+        rows = db.scalars(q).all()
+        for r in rows:
+            db.delete(r)
+    _wake.set()
+    await u.message.reply_text(f"🗑 Deleted {len(rows)} reminder(s).")
+
+
+def register_handlers(app: Application):
+    commands.add(app, "remind",     cmd_remind, "Daily reminder at HH:MM")
+    commands.add(app, "reminders",  cmd_list,   "List your reminders")
+    commands.add(app, "remind_del", cmd_delete, "Delete a reminder")
@@ -0,0 +1,160 @@
+# report.py
+"""
+Weekly personal study report.
+
+  /weekly_report on|off     → opt in / out (delivered Monday morning)
+  /weekly_report now        → your report for the week so far
+
+All reports for a week come from two grouped queries (study time per user
+and TaskType, doubts per user and subject) joined to the opt-in table,
+plus the in-memory streaks – never one query per user.  Rendered texts go
+through fanout.bulk, which paces delivery below Telegram's limits.
+"""
+
+from __future__ import annotations
+import asyncio, datetime as dt, logging
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from sqlalchemy import func, select
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+import streak
+from database import session_scope, Doubt, ReportOptIn, StudyLog
+from fanout import bulk
+
+log = logging.getLogger(__name__)
+
+SEND_AT = dt.time(2, 30)           # Monday 02:30 UTC = 08:00 IST
+
+_loop: asyncio.Task | None = None
+
+
+# ───────────────────────── aggregation
+def _week_bounds(day: dt.date) -> Tuple[dt.datetime, dt.datetime]:
+    start = dt.datetime.combine(day - dt.timedelta(days=day.weekday()), dt.time())
+    return start, start + dt.timedelta(days=7)
+
+
+def collect(start: dt.datetime, end: dt.datetime, user_id: int | None = None):
+    """
+    One pass over the week: ({user: {task_type: secs}}, {user: {subject: n}})
+    for opted-in users (or just `user_id`).
+    """
+    study: Dict[int, Dict[str, int]] = defaultdict(dict)
+    doubts: Dict[int, Dict[str, int]] = defaultdict(dict)
+
+    sq = (
+        select(StudyLog.user_id, StudyLog.task_type, func.sum(StudyLog.seconds))
+        .where(StudyLog.ended_at >= start, StudyLog.ended_at < end)
+        .group_by(StudyLog.user_id, StudyLog.task_type)
+    )
+    dq = (
+        select(Doubt.user_id, Doubt.subject, func.count())
+        .where(Doubt.timestamp >= start, Doubt.timestamp < end)
+        .group_by(Doubt.user_id, Doubt.subject)
+    )
+    if user_id is None:
+        sq = sq.join(ReportOptIn, ReportOptIn.user_id == StudyLog.user_id)
+        dq = dq.join(ReportOptIn, ReportOptIn.user_id == Doubt.user_id)
+    else:
+        sq = sq.where(StudyLog.user_id == user_id)
+        dq = dq.where(Doubt.user_id == user_id)
+
+    with session_scope() as db:
+        for uid, tt, secs in db.execute(sq):
+            study[uid][tt or "Pomodoro"] = int(secs)
+        for uid, subj, n in db.execute(dq):
+            doubts[uid][subj] = n
+    return study, doubts
+
+
+def _fmt(s: int) -> str:
+    h, m = divmod(s // 60, 60)
+    return f"{h}h {m:02d}m"
+
+
+def render(uid: int, start: dt.datetime, study: Dict[str, int], doubts: Dict[str, int]) -> str:
+    total = sum(study.values())
+    lines = [f"📊 Weekly report • {start:%d %b}", f"Study time: {_fmt(total)}"]
+    for tt, secs in sorted(study.items(), key=lambda kv: -kv[1]):
+        lines.append(f"  • {tt}: {_fmt(secs)}")
+    s = streak.streaks.get(uid)
+    lines.append(f"🔥 Streak: {s.days if s else 0} day(s)")
+    n = sum(doubts.values())
+    lines.append(f"❓ Doubts raised: {n}")
+    for subj, k in sorted(doubts.items(), key=lambda kv: -kv[1]):
+        lines.append(f"  • {subj}: {k}")
+    return "\n".join(lines)
+
+
+def _opted_in() -> list[int]:
+    with session_scope() as db:
+        return list(db.scalars(select(ReportOptIn.user_id)))
+
+
+# ───────────────────────── weekly delivery
+async def send_week(start: dt.datetime, end: dt.datetime) -> int:
+    study, doubts = await asyncio.to_thread(collect, start, end)
+    users = await asyncio.to_thread(_opted_in)
+    # render lazily: the bounded bulk queue paces this loop
+    for uid in users:
+        await bulk.enqueue(uid, render(uid, start, study.get(uid, {}), doubts.get(uid, {})))
+    log.info("weekly report: %d queued", len(users))
+    return len(users)
+
+
+def _next_run(now: dt.datetime) -> dt.datetime:
+    monday = now.date() - dt.timedelta(days=now.weekday())
+    run = dt.datetime.combine(monday, SEND_AT)
+    return run if run > now else run + dt.timedelta(days=7)
+
+
+async def _weekly():
+    while True:
+        run = _next_run(clock.utcnow())
+        await clock.sleep((run - clock.utcnow()).total_seconds())
+        start, end = _week_bounds(run.date() - dt.timedelta(days=7))
+        try:
+            await send_week(start, end)
+        except Exception:
+            log.exception("weekly report failed")
+
+
+async def on_startup(app: Application):
+    global _loop
+    bulk.start(app.bot)
+    _loop = asyncio.create_task(_weekly())
+
+
+def on_shutdown():
+    if _loop:
+        _loop.cancel()
+
+
+# ───────────────────────── command
+async def cmd_report(u: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    arg = ctx.args[0].lower() if ctx.args else ""
+    uid = u.effective_user.id
+    if arg == "now":
+        start, end = _week_bounds(clock.today())
+        study, doubts = await asyncio.to_thread(collect, start, end, uid)
+        return await u.message.reply_text(
+            render(uid, start, study.get(uid, {}), doubts.get(uid, {}))
+        )
+    if arg not in ("on", "off"):
+        return await u.message.reply_text("Use /weekly_report on|off|now")
+    with session_scope() as db:
+        row = db.get(ReportOptIn, uid)
+        if arg == "on" and not row:
+            db.add(ReportOptIn(user_id=uid))
+        elif arg == "off" and row:
+            db.delete(row)
+    await u.message.reply_text(f"Weekly report {'ON' if arg == 'on' else 'OFF'}")
+
+
+def register_handlers(app: Application):
+    commands.add(app, "weekly_report", cmd_report, "Weekly study report on/off")
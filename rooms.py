@@ -0,0 +1,304 @@
+# rooms.py
+"""
+Group Pomodoro rooms – one shared schedule for everyone who joins.
+
+Usage
+-----
+/room_create NAME [work] [break] [cycles] [long]
+                      → open a room (defaults 25 | 5, 4 cycles, 15-min long break);
+                        NAME is 1-30 of a-z, 0-9 and "-"
+/room_join NAME       → join from any chat
+/room_leave           → leave your room
+/room_status          → phase & time left
+/room_stop            → close the room (owner only)
+
+If the owner leaves, the longest-present member becomes owner; a room
+whose last member leaves is closed.
+
+A room is one sleeping task regardless of its size: it wakes only at phase
+changes, renders the notice once and fans it out per *chat* (not per
+member), so 500 members in one group cost a single message.
+"""
+
+from __future__ import annotations
+import asyncio, logging, re
+from typing import Dict
+
+from telegram import Update
+from telegram.error import Forbidden
+from telegram.ext import Application, ContextTypes
+
+import clock
+import commands
+import leaderboard
+from fanout import fan_out
+
+log = logging.getLogger(__name__)
+
+DEFAULTS = (25, 5, 4, 15)      # work, break, cycles, long break (minutes)
+RESTORE_LATE = 120             # s; rooms whose phase ended earlier aren't restored
+NAME_RE = re.compile(r"[a-z0-9-]{1,30}")   # nothing Markdown would parse
+
+
+class Room:
+    __slots__ = (
+        "name", "owner", "work", "brk", "long", "cycles",
+        "cycle", "phase", "phase_end", "members", "joined", "chats", "task",
+    )
+
+    def __init__(self, name: str, owner: int, work: int, brk: int, cycles: int, long: int):
+        self.name   = name
+        self.owner  = owner
+        self.work   = work * 60
+        self.brk    = brk * 60
+        self.long   = long * 60
+        self.cycles = cycles
+        self.cycle  = 1
+        self.phase  = "work"
+        self.phase_end = clock.time() + self.work
+        self.members: Dict[int, int] = {}   # user_id → chat_id joined from
+        self.joined:  Dict[int, float] = {} # user_id → join time
+        self.chats:   Dict[int, int] = {}   # chat_id → member count
+        self.task: asyncio.Task | None = None
+
+    def add(self, uid: int, cid: int, at: float | None = None):
+        self.members[uid] = cid
+        self.joined[uid] = clock.time() if at is None else at
+        self.chats[cid] = self.chats.get(cid, 0) + 1
+
+    def remove(self, uid: int):
+        cid = self.members.pop(uid, None)
+        if cid is None:
+            return
+        self.joined.pop(uid, None)
+        left = self.chats[cid] - 1
+        if left:
+            self.chats[cid] = left
+        else:
+            del self.chats[cid]
+        self._handover()
+
+    def drop_chat(self, cid: int):
+        self.chats.pop(cid, None)
+        for uid in [u for u, c in self.members.items() if c == cid]:
+            del self.members[uid]
+            self.joined.pop(uid, None)
+        self._handover()
+
+    def _handover(self):
+        # owner gone → longest-present member can /room_stop
+        if self.owner not in self.members and self.members:
+            self.owner = min(self.members, key=self.joined.__getitem__)
+
+    def credits(self):
+        """(uid, cid, seconds) for the work phase ending now – only the part each member was here for."""
+        for uid, cid in self.members.items():
+            yield uid, cid, int(min(self.work, self.phase_end - self.joined[uid]))
+
+    def advance(self) -> str | None:
+        """Move to the next phase; returns its notice, or None when finished."""
+        now = clock.time()
+        if self.phase == "work":
+            if self.cycle >= self.cycles:
+                self.phase, length = "long", self.long
+                msg = f"🌴 Long break ({self.long // 60}-min) – all {self.cycles} cycles done!"
+            else:
+                self.phase, length = "break", self.brk
+                msg = f"⏰ Break ({self.brk // 60}-min) • cycle {self.cycle}/{self.cycles}"
+        elif self.phase == "break":
+            self.cycle += 1
+            self.phase, length = "work", self.work
+            msg = f"🟢 Focus ({self.work // 60}-min) • cycle {self.cycle}/{self.cycles}"
+        else:
+            return None
+        self.phase_end = now + length
+        return f"[{self.name}] {msg}"
+
+
+rooms:   Dict[str, Room] = {}      # name → room
+members: Dict[int, str]  = {}      # user_id → room name
+
+
+# ───────────────────────── broadcast / loop
+async def _broadcast(room: Room, bot, text: str):
+    async def send(cid: int):
+        await bot.send_message(cid, text)
+
+    failed = await fan_out(send, list(room.chats))
+    for cid, err in failed.items():
+        if isinstance(err, Forbidden):
+            for uid, c in list(room.members.items()):
+                if c == cid:
+                    members.pop(uid, None)
+            room.drop_chat(cid)
+        else:
+            log.warning("room %s: send to %s failed: %s", room.name, cid, err)
+
+
+async def _run(room: Room, bot):
+    try:
+        while True:
+            await clock.sleep(max(0.0, room.phase_end - clock.time()))
+            if room.phase == "work":
+                leaderboard.record_many(
+                    (uid, cid, None, None, secs) for uid, cid, secs in room.credits()
+                )
+            text = room.advance()
+            if text is None:
+                await _broadcast(room, bot, f"[{room.name}] ✅ Session complete!")
+                break
+            await _broadcast(room, bot, text)
+            if not room.members:              # every chat blocked the bot
+                break
+    except asyncio.CancelledError:
+        pass
+    finally:
+        _close(room)
+
+
+def _close(room: Room):
+    if rooms.get(room.name) is room:
+        rooms.pop(room.name, None)
+        for uid in room.members:
+            members.pop(uid, None)
+
+
+def _leave(uid: int) -> Room | None:
+    room = rooms.get(members.pop(uid, ""))
+    if room:
+        room.remove(uid)
+        if not room.members:              # last one out closes the room
+            _close(room)
+            if room.task:
+                room.task.cancel()
+    return room
+
+
+def _left(room: Room) -> str:
+    mm, ss = divmod(max(0, int(room.phase_end - clock.time())), 60)
+    phase = {"work": "Focus", "break": "Break", "long": "Long break"}[room.phase]
+    return f"{phase} {room.cycle}/{room.cycles}: {mm}m {ss}s left"
+
+
+# ───────────────────────── checkpoint (see checkpoint.py)
+_SAVED = ("owner", "work", "brk", "long", "cycles", "cycle", "phase", "phase_end")
+
+
+def checkpoint():
+    return [
+        (r.name, {**{k: getattr(r, k) for k in _SAVED},
+                  "members": [(u, c, r.joined[u]) for u, c in r.members.items()]})
+        for r in list(rooms.values())
+    ]
+
+
+def restore(rows, bot):
+    for name, d in rows:
+        if d["phase_end"] < clock.time() - RESTORE_LATE:
+            continue                      # phase ended long ago – drop the room
+        room = Room.__new__(Room)
+        for k in _SAVED:
+            setattr(room, k, d[k])
+        room.name, room.members, room.joined, room.chats = name, {}, {}, {}
+        for uid, cid, at in d["members"]:
+            room.add(uid, cid, at)
+            members[uid] = name
+        rooms[name] = room
+        room.task = asyncio.create_task(_run(room, bot))
+
+
+def on_shutdown():
+    for r in list(rooms.values()):
+        if r.task:
+            r.task.cancel()
+
+
+# ───────────────────────── commands
+async def room_create(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    if not ctx.args:
+        return await upd.message.reply_text(
+            "Usage: /room_create NAME [work] [break] [cycles] [long]"
+        )
+    name = ctx.args[0].lower()
+    if not NAME_RE.fullmatch(name):
+        return await upd.message.reply_text(
+            "❌ Room names are 1-30 characters: a-z, 0-9 and '-'."
+        )
+    if name in rooms:
+        return await upd.message.reply_text(f"ℹ️ Room *{name}* exists – /room_join {name}",
+                                            parse_mode="Markdown")
+    try:
+        nums = [max(1, int(a)) for a in ctx.args[1:5]]
+    except ValueError:
+        return await upd.message.reply_text("❌ Durations must be whole minutes.")
+    work, brk, cycles, long = nums + list(DEFAULTS[len(nums):])
+
+    uid, cid = upd.effective_user.id, upd.effective_chat.id
+    leaderboard.names[uid] = upd.effective_user.first_name
+    _leave(uid)
+    room = rooms[name] = Room(name, uid, work, brk, cycles, long)
+    room.add(uid, cid)
+    members[uid] = name
+    room.task = asyncio.create_task(_run(room, ctx.bot))
+    await upd.message.reply_text(
+        f"🟢 Room *{name}* started • {cycles}× {work}|{brk}, long break {long}-min.\n"
+        f"Others join with /room_join {name}",
+        parse_mode="Markdown",
+    )
+
+
+async def room_join(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    name = ctx.args[0].lower() if ctx.args else ""
+    room = rooms.get(name)
+    if not room:
+        return await upd.message.reply_text("ℹ️ No such room.")
+    uid = upd.effective_user.id
+    if members.get(uid) == name:          # _leave() could close this very room
+        return await upd.message.reply_text(
+            f"ℹ️ You're already in *{name}* • {_left(room)}", parse_mode="Markdown"
+        )
+    leaderboard.names[uid] = upd.effective_user.first_name
+    _leave(uid)
+    room.add(uid, upd.effective_chat.id)
+    members[uid] = name
+    await upd.message.reply_text(
+        f"👋 Joined *{name}* ({len(room.members)} studying) • {_left(room)}",
+        parse_mode="Markdown",
+    )
+
+
+async def room_leave(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    room = _leave(upd.effective_user.id)
+    if not room:
+        return await upd.message.reply_text("ℹ️ You're not in a room.")
+    note = "" if room.members else " It was empty, so it's closed."
+    await upd.message.reply_text(f"🚪 Left *{room.name}*.{note}", parse_mode="Markdown")
+
+
+async def room_status(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    room = rooms.get(members.get(upd.effective_user.id, ""))
+    if not room:
+        return await upd.message.reply_text("ℹ️ You're not in a room.")
+    await upd.message.reply_text(
+        f"⏱ *{room.name}* • {_left(room)} • {len(room.members)} member(s)",
+        parse_mode="Markdown",
+    )
+
+
+async def room_stop(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
+    room = rooms.get(members.get(upd.effective_user.id, ""))
+    if not room or room.owner != upd.effective_user.id:
+        return await upd.message.reply_text("ℹ️ Only the room owner can stop it.")
+    _close(room)
+    if room.task:
+        room.task.cancel()
+    await _broadcast(room, ctx.bot, f"[{room.name}] 🚫 Room closed.")
+
+
+# ───────────────────────── registration
+def register_handlers(app: Application):
+    commands.add(app, "room_create", room_create, "Open a group Pomodoro room")
+    commands.add(app, "room_join",   room_join,   "Join a Pomodoro room")
+    commands.add(app, "room_leave",  room_leave,  "Leave your room")
+    commands.add(app, "room_status", room_status, "Room phase & time left")
+    commands.add(app, "room_stop",   room_stop,   "Close your room")
@@ -0,0 +1,105 @@
+# sessions.py
+"""
+Typed store for live per-chat state (Pomodoro timers, stopwatch tasks,
+countdown subscriptions).
+
+Each kind has a `__slots__` record with explicit fields – no per-session
+dict, no optional keys – and a SessionStore mapping chat_id → record.
+Timestamps are epoch floats; "not set" is 0.0 rather than None so every
+field keeps one type.  `snapshot()` copies only the key/value lists, so it
+is cheap and safe to iterate while handlers keep mutating the store.
+"""
+
+from __future__ import annotations
+import datetime as dt
+from typing import Dict, Generic, Iterator, Tuple, TypeVar
+
+
+class TimerSession:
+    """Pomodoro started with /timer."""
+    __slots__ = ("user_id", "name", "phase", "work", "brk", "remain", "start")
+
+    def __init__(self, user_id: int, name: str, work: int, brk: int, start: float):
+        self.user_id = user_id
+        self.name    = name
+        self.phase   = "work"          # "work" | "break"
+        self.work    = work            # seconds
+        self.brk     = brk             # seconds
+        self.remain  = float(work)     # seconds left when `start` was taken
+        self.start   = start
+
+
+class TaskSession:
+    """Stopwatch started with /task_start."""
+    __slots__ = ("user_id", "name", "task_type", "start", "paused")
+
+    def __init__(self, user_id: int, name: str, task_type: str, start: float):
+        self.user_id   = user_id
+        self.name      = name          # starter's first_name, for the leaderboard
+        self.task_type = task_type
+        self.start     = start
+        self.paused    = 0.0           # pause timestamp; 0.0 = running
+
+
+class CountdownSession:
+    """A chat's live message subscribed to a shared countdown."""
+    __slots__ = ("key", "msg_id")
+
+    def __init__(self, key: Tuple[dt.datetime, str], msg_id: int):
+        self.key    = key              # (target UTC, label)
+        self.msg_id = msg_id
+
+
+S = TypeVar("S", TimerSession, TaskSession, CountdownSession)
+
+
+class SessionStore(Generic[S]):
+    __slots__ = ("kind", "_by_chat")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._by_chat: Dict[int, S] = {}
+
+    def get(self, chat_id: int) -> S | None:
+        return self._by_chat.get(chat_id)
+
+    def put(self, chat_id: int, s: S) -> S:
+        self._by_chat[chat_id] = s
+        return s
+
+    def pop(self, chat_id: int) -> S | None:
+        return self._by_chat.pop(chat_id, None)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._by_chat
+
+    def __len__(self) -> int:
+        return len(self._by_chat)
+
+    def items(self) -> Iterator[Tuple[int, S]]:
+        return iter(self._by_chat.items())
+
+    def snapshot(self) -> Iterator[Tuple[int, S]]:
+        """Point-in-time (chat_id, session) pairs; the store may change meanwhile."""
+        # two flat list copies + zip: no per-item tuple kept alive, so a
+        # million-entry snapshot doesn't wake the cyclic GC repeatedly
+        return zip(list(self._by_chat), list(self._by_chat.values()))
+
+
+def dump(s: S) -> dict:
+    """Slot values as a plain dict (JSON-able for every session kind but countdowns)."""
+    return {k: getattr(s, k) for k in type(s).__slots__}
+
+
+def load(cls: type[S], d: dict) -> S:
+    s = cls.__new__(cls)
+    for k in cls.__slots__:
+        setattr(s, k, d[k])
+    return s
+
+
+timers:     SessionStore[TimerSession]     = SessionStore("timer")
+tasks:      SessionStore[TaskSession]      = SessionStore("task")
+countdowns: SessionStore[CountdownSession] = SessionStore("countdown")
+
+STORES = (timers, tasks, countdowns)
@@ -1,15 +1,18 @@
 # streak.py – simple, async loop every hour (no JobQueue)
 import asyncio, datetime as dt
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import Application, ContextTypes
 from telegram import Update
+import clock
+import commands
 
-class Streak: __slots__=("days","last","alerts"); 
-streaks={}
+class Streak:
+    __slots__=("days","last","alerts")
+    def __init__(self): self.days=0; self.last=None; self.alerts=True   # last: dt.date|None
+streaks:dict[int,Streak]={}
 
 async def checkin(u:Update,_):
-    uid=u.effective_user.id; today=dt.date.today()
-    s=streaks.setdefault(uid,Streak()); 
-    if not hasattr(s,"days"): s.days=0;s.last=None;s.alerts=True
+    uid=u.effective_user.id; today=clock.today()
+    s=streaks.get(uid) or streaks.setdefault(uid,Streak())
     if s.last==today: return await u.message.reply_text("Already checked-in!")
     s.days = s.days+1 if s.last and (today-s.last).days==1 else 1
     s.last=today
@@ -23,22 +26,38 @@ async def mystreak(u:Update,_):
 async def toggle(u:Update,ctx):
     arg=(ctx.args[0].lower() if ctx.args else "")
     if arg not in ("on","off"): return await u.message.reply_text("Use on/off")
-    s=streaks.setdefault(u.effective_user.id,Streak()); s.alerts=(arg=="on")
+    uid=u.effective_user.id
+    s=streaks.get(uid) or streaks.setdefault(uid,Streak()); s.alerts=(arg=="on")
     await u.message.reply_text(f"Alerts {'ON' if s.alerts else 'OFF'}")
 
 async def _hourly(bot):
     while True:
-        today=dt.date.today()
+        today=clock.today()
         for uid,s in streaks.items():
             if s.alerts and s.last and (today-s.last).days>=2:
                 try: await bot.send_message(uid,"⚠️ You broke your streak.")
                 except: pass
                 s.alerts=False
-        await asyncio.sleep(3600)
+        await clock.sleep(3600)
 
 def register_handlers(app:Application):
-    app.add_handler(CommandHandler("checkin",checkin))
-    app.add_handler(CommandHandler("mystreak",mystreak))
-    app.add_handler(CommandHandler("streak_alerts",toggle))
-    async def _post_init(a): a.create_task(_hourly(a.bot))
-    app.post_init(_post_init)
+    commands.add(app,"checkin",checkin,"Record today’s check-in")
+    commands.add(app,"mystreak",mystreak,"Show study streak")
+    commands.add(app,"streak_alerts",toggle,"Toggle streak alerts")
+
+_loop=None
+async def on_startup(app:Application):
+    global _loop; _loop=asyncio.create_task(_hourly(app.bot))
+
+# checkpoint (see checkpoint.py)
+def checkpoint():
+    return [(str(uid),{"days":s.days,"last":s.last and s.last.isoformat(),"alerts":s.alerts})
+            for uid,s in list(streaks.items())]
+
+def restore(rows,_bot):
+    for key,d in rows:
+        s=streaks[int(key)]=Streak(); s.days=d["days"]; s.alerts=d["alerts"]
+        s.last=dt.date.fromisoformat(d["last"]) if d["last"] else None
+
+def on_shutdown():
+    if _loop: _loop.cancel()
@@ -1,10 +1,16 @@
 # study_tasks.py  – stopwatch that shows elapsed every 2 s
-import asyncio, time
+import asyncio
 from enum import Enum
 from typing import Dict
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
+from telegram.ext import Application, CallbackQueryHandler, ContextTypes
+
+import clock
+import commands
+import leaderboard
+import sessions
+from sessions import TaskSession, tasks
 
 class TaskType(str, Enum):
     MOCK = "Mock", "📝 Mock"
@@ -23,10 +29,9 @@ class TaskType(str, Enum):
     def __new__(cls, key, label):
         obj = str.__new__(cls, key); obj._value_ = key; obj.label = label; return obj
 
-_active: Dict[int, dict] = {}
-_loops:  Dict[int, asyncio.Task] = {}
+_loops:  Dict[int, asyncio.Task] = {}   # per-chat state lives in sessions.tasks
 
-def _elapsed(meta): return int(time.time() - meta["start"])
+def _elapsed(s): return int((s.paused or clock.time()) - s.start)
 def _fmt(s): h, rem = divmod(s,3600); m, s = divmod(rem,60); return f"{h:02d}:{m:02d}:{s:02d}"
 
 # ── handlers ─────────────────────────────────────────────────
@@ -46,52 +51,66 @@ async def chosen(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid = q.message.chat.id
     if cid in _loops:
         _loops[cid].cancel()
-    _active[cid] = {"type": raw, "start": time.time()}
+    tasks.put(cid, TaskSession(q.from_user.id, q.from_user.first_name, raw, clock.time()))
     await q.edit_message_text(f"🟢 *{raw}* started.\nUse /task_pause or /task_stop.", parse_mode="Markdown")
     _loops[cid]=asyncio.create_task(_tick_loop(cid, ctx.bot))
 
 async def _tick_loop(cid, bot):
     try:
-        while cid in _active:
-            await bot.send_message(cid, f"⏱ {_fmt(_elapsed(_active[cid]))} elapsed.", disable_notification=True)
-            await asyncio.sleep(2)
+        while (s := tasks.get(cid)):
+            await bot.send_message(cid, f"⏱ {_fmt(_elapsed(s))} elapsed.", disable_notification=True)
+            await clock.sleep(2)
     except asyncio.CancelledError:
         pass
 
 async def pause(update: Update, _):
     cid=update.effective_chat.id
-    if cid not in _active or cid in _active and _active[cid].get("paused"):
+    s=tasks.get(cid)
+    if not s or s.paused:
         return await update.message.reply_text("Nothing to pause.")
-    _active[cid]["paused"]=time.time()
+    s.paused=clock.time()
     _loops[cid].cancel(); _loops.pop(cid,None)
     await update.message.reply_text("⏸ Paused.")
 
 async def resume(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid=update.effective_chat.id
-    meta=_active.get(cid)
-    if not meta or "paused" not in meta:
+    s=tasks.get(cid)
+    if not s or not s.paused:
         return await update.message.reply_text("Nothing to resume.")
-    meta["start"] += time.time()-meta.pop("paused")
+    s.start += clock.time()-s.paused; s.paused=0.0
     _loops[cid]=asyncio.create_task(_tick_loop(cid, ctx.bot))
     await update.message.reply_text("▶️ Resumed.")
 
 async def stop(update: Update, _):
     cid=update.effective_chat.id
     if cid in _loops: _loops[cid].cancel(); _loops.pop(cid,None)
-    meta=_active.pop(cid,None)
-    if not meta: return await update.message.reply_text("Nothing to stop.")
-    await update.message.reply_text(f"✅ Logged {_fmt(_elapsed(meta))} on {meta['type']}.")
+    s=tasks.pop(cid)
+    if not s: return await update.message.reply_text("Nothing to stop.")
+    leaderboard.record(s.user_id, cid, s.name, s.task_type, _elapsed(s))
+    await update.message.reply_text(f"✅ Logged {_fmt(_elapsed(s))} on {s.task_type}.")
 
 async def status(update: Update, _):
     cid=update.effective_chat.id
-    meta=_active.get(cid)
-    if not meta: return await update.message.reply_text("No active task.")
-    await update.message.reply_text(f"⏱ {_fmt(_elapsed(meta))} elapsed on {meta['type']}.")
+    s=tasks.get(cid)
+    if not s: return await update.message.reply_text("No active task.")
+    await update.message.reply_text(f"⏱ {_fmt(_elapsed(s))} elapsed on {s.task_type}.")
+
+# ── checkpoint (see checkpoint.py) ───────────────────────────
+def checkpoint():
+    return [(str(cid), sessions.dump(s)) for cid, s in tasks.snapshot()]
+
+def restore(rows, bot):
+    for key, d in rows:
+        cid=int(key); d.setdefault("name", None); s=tasks.put(cid, sessions.load(TaskSession, d))
+        if not s.paused: _loops[cid]=asyncio.create_task(_tick_loop(cid, bot))
+
+def on_shutdown():
+    for t in _loops.values(): t.cancel()
 
 def register_handlers(app: Application):
-    app.add_handler(CommandHandler("task_start", cmd_start))
+    commands.add(app, "task_start",  cmd_start, "Start stopwatch study task")
+    commands.add(app, "task_status", status,    "Show task timer")
+    commands.add(app, "task_pause",  pause,     "Pause task")
+    commands.add(app, "task_resume", resume,    "Resume task")
+    commands.add(app, "task_stop",   stop,      "Stop & log task")
     app.add_handler(CallbackQueryHandler(chosen, pattern=r"^T\|"))
-    app.add_handler(CommandHandler("task_pause",  pause))
-    app.add_handler(CommandHandler("task_resume", resume))
-    app.add_handler(CommandHandler("task_stop",   stop))
-    app.add_handler(CommandHandler("task_status", status))
@@ -1,19 +1,21 @@
 # timer.py
 """
 Pomodoro-style timer with inline-keyboard presets **and** classic
-commands (/task_pause, /task_resume, /task_stop, /task_status).
+commands (/timer_pause, /timer_resume, /timer_stop, /timer_status).
 
 Usage
 -----
 /timer               → choose preset (25|5, 50|10, Custom …)
-/task_pause          → pause
-/task_resume         → resume
-/task_stop           → cancel
-/task_status         → remaining time
+/timer_pause         → pause
+/timer_resume        → resume
+/timer_stop          → cancel
+/timer_status        → remaining time
+
+(/task_* belongs to the stopwatch in study_tasks.py.)
 """
 
 from __future__ import annotations
-import asyncio, time
+import asyncio
 from typing import Dict, Tuple
 
 from telegram import (
@@ -31,10 +33,17 @@ from telegram.ext import (
     filters,
 )
 
+import clock
+import commands
+import leaderboard
+import sessions
+from sessions import TimerSession, timers
+
 CHOOSING, ASK_WORK, ASK_BREAK = range(3)
 
 active: Dict[int, asyncio.Task] = {}        # chat_id → asyncio.Task
-info:   Dict[int, dict]          = {}        # chat_id → meta dict
+RESTORE_LATE = 120                          # s; older missed phase ends are dropped on restore
+# per-chat state lives in sessions.timers
 
 
 # ───────────────────────── helpers
@@ -95,49 +104,42 @@ async def cancel(upd: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
 async def _begin(src, ctx: ContextTypes.DEFAULT_TYPE, work_m: int, brk_m: int) -> int:
     chat = src.message.chat if hasattr(src, "message") and src.message else src.effective_chat
     cid  = chat.id
+    user = getattr(src, "from_user", None) or src.effective_user
 
     # cancel existing
     t = active.pop(cid, None)
     if t: t.cancel()
 
-    info[cid] = meta = {
-        "phase": "work",
-        "work":  _m2s(work_m),
-        "break": _m2s(brk_m),
-        "remain": _m2s(work_m),
-        "start":  time.time(),
-    }
+    timers.put(cid, TimerSession(user.id, user.first_name, _m2s(work_m), _m2s(brk_m), clock.time()))
 
     await ctx.bot.send_message(
         cid,
         f"🟢 Study started • {work_m}-min focus → {brk_m}-min break.\n"
-        "Use /task_pause or /task_stop.",
+        "Use /timer_pause or /timer_stop.",
     )
-    _launch(cid, ctx)
+    _launch(cid, ctx.bot)
     return ConversationHandler.END
 
 
-def _launch(cid: int, ctx: ContextTypes.DEFAULT_TYPE):
-    meta = info[cid]
+def _launch(cid: int, bot):
+    s = timers.get(cid)
 
     async def loop():
         try:
-            end = time.time() + meta["remain"]
-            while True:
-                remain = int(end - time.time())
-                if remain <= 0: break
-                await asyncio.sleep(2)
+            # one timer per phase; pause/stop cancel this task
+            await clock.sleep(s.remain)
 
             # phase switch
-            if meta["phase"] == "work":
-                meta["phase"]  = "break"
-                meta["remain"] = meta["break"]
-                meta["start"]  = time.time()
-                await ctx.bot.send_message(cid, f"⏰ Break started ({meta['break']//60}-min).")
-                _launch(cid, ctx)
+            if s.phase == "work":
+                leaderboard.record(s.user_id, cid, s.name, None, s.work)
+                s.phase  = "break"
+                s.remain = float(s.brk)
+                s.start  = clock.time()
+                await bot.send_message(cid, f"⏰ Break started ({s.brk//60}-min).")
+                _launch(cid, bot)
             else:
-                await ctx.bot.send_message(cid, "✅ Session complete!")
-                active.pop(cid, None); info.pop(cid, None)
+                await bot.send_message(cid, "✅ Session complete!")
+                active.pop(cid, None); timers.pop(cid)
         except asyncio.CancelledError:
             pass
 
@@ -148,42 +150,72 @@ def _launch(cid: int, ctx: ContextTypes.DEFAULT_TYPE):
 async def task_pause(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid = upd.effective_chat.id
     t   = active.pop(cid, None)
-    m   = info.get(cid)
-    if not m or not t:
+    s   = timers.get(cid)
+    if not s or not t:
         return await upd.message.reply_text("ℹ️ No active session.")
-    m["remain"] -= time.time() - m["start"]
+    s.remain -= clock.time() - s.start
     t.cancel()
-    await upd.message.reply_text("⏸️ Paused.  /task_resume to continue.")
+    await upd.message.reply_text("⏸️ Paused.  /timer_resume to continue.")
 
 
 async def task_resume(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid = upd.effective_chat.id
-    if cid in active or cid not in info:
+    s   = timers.get(cid)
+    if cid in active or not s:
         return await upd.message.reply_text("ℹ️ Nothing to resume.")
-    info[cid]["start"] = time.time()
-    _launch(cid, ctx)
+    s.start = clock.time()
+    _launch(cid, ctx.bot)
     await upd.message.reply_text("▶️ Resumed.")
 
 
 async def task_stop(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid = upd.effective_chat.id
     t   = active.pop(cid, None)
-    info.pop(cid, None)
+    timers.pop(cid)
     if t: t.cancel()
     await upd.message.reply_text("🚫 Session cancelled.")
 
 
 async def task_status(upd: Update, ctx: ContextTypes.DEFAULT_TYPE):
     cid = upd.effective_chat.id
-    m   = info.get(cid)
-    if not m:
+    s   = timers.get(cid)
+    if not s:
         return await upd.message.reply_text("ℹ️ No active session.")
-    rem = max(0, int(m["remain"] - (time.time() - m["start"])))
+    rem = max(0, int(s.remain - (clock.time() - s.start)))
     mm, ss = divmod(rem, 60)
-    phase  = "Study" if m["phase"] == "work" else "Break"
+    phase  = "Study" if s.phase == "work" else "Break"
     await upd.message.reply_text(f"⏱ {phase}: {mm}m {ss}s left.")
 
 
+# ───────────────────────── checkpoint (see checkpoint.py)
+def checkpoint():
+    return [(str(cid), {**sessions.dump(s), "running": cid in active})
+            for cid, s in timers.snapshot()]
+
+
+def restore(rows, bot):
+    for key, d in rows:
+        cid = int(key)
+        s = sessions.load(TimerSession, d)
+        if d["running"]:
+            # time spent in the phase (downtime included) is used up;
+            # remain == 0 → _launch switches phase straight away
+            now  = clock.time()
+            left = s.remain - (now - s.start)
+            if left < -RESTORE_LATE:
+                continue              # phase ended long ago – drop, don't announce
+            s.remain = max(0.0, left)
+            s.start  = now
+        timers.put(cid, s)
+        if d["running"]:
+            _launch(cid, bot)
+
+
+def on_shutdown():
+    for t in active.values():
+        t.cancel()
+
+
 # ───────────────────────── registration
 def register_handlers(app: Application):
     wizard = ConversationHandler(
@@ -201,8 +233,9 @@ def register_handlers(app: Application):
     )
     app.add_handler(wizard)
 
-    app.add_handler(CommandHandler("task_pause",  task_pause))
-    app.add_handler(CommandHandler("task_resume", task_resume))
-    app.add_handler(CommandHandler("task_stop",   task_stop))
-    app.add_handler(CommandHandler("task_status", task_status))
-    
+    commands.add(app, "timer",        None,        "Start Pomodoro", owner=__name__)
+    commands.add(app, "timer_status", task_status, "Pomodoro status")
+    commands.add(app, "timer_pause",  task_pause,  "Pause Pomodoro")
+    commands.add(app, "timer_resume", task_resume, "Resume Pomodoro")
+    commands.add(app, "timer_stop",   task_stop,   "Stop Pomodoro")
+